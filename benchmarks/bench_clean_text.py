@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark clean_text on synthetic job pages from 10 KB to 20 MB.
+
+For every size the page is cleaned with the original five-pass
+implementation, the current clean_text on the whole string, and
+iter_clean_text over 64 KB chunks. Outputs are checked to be identical,
+then throughput (MB/s) and peak memory (tracemalloc) are reported.
+
+    python benchmarks/bench_clean_text.py [--sizes 10K,1M,20M] [--chunk-size 65536]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+from utils import clean_text, iter_clean_text
+
+FRAGMENTS = [
+    '<div class="job-description">', '</div>', '<p>', '</p>', '<li>', '</li>',
+    '<a href="https://careers.example.com/jobs/12345?ref=nav">', '</a>',
+    'We are looking for a Senior Python Developer with 5+ years of experience. ',
+    'Skills: Python, Django, REST APIs, PostgreSQL & AWS. ',
+    'Apply at https://jobs.example.com/apply/98765 today! ',
+    'Benefits include health, dental & 401(k) matching.\n',
+    'Café culture — remote-friendly, flexible hours…\t',
+    '<script>window.__DATA__ = {"id": 1};</script>',
+    '<!-- tracking pixel -->', '&nbsp;', '\n\n    ',
+]
+
+
+def legacy_clean_text(text):
+    """The original multi-pass implementation, kept for comparison"""
+    text = re.sub(r'<[^>]*?>', '', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'[^a-zA-Z0-9 ]', '', text)
+    text = re.sub(r'\s{2,}', ' ', text)
+    text = text.strip()
+    text = ' '.join(text.split())
+    return text
+
+
+def make_page(size):
+    rng = random.Random(size)
+    parts = []
+    total = 0
+    while total < size:
+        fragment = rng.choice(FRAGMENTS)
+        parts.append(fragment)
+        total += len(fragment)
+    return ''.join(parts)[:size]
+
+
+def chunked(text, chunk_size):
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+
+def parse_size(value):
+    units = {'K': 1024, 'M': 1024 * 1024}
+    value = value.strip().upper()
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def measure(func, page):
+    """Time one run, then trace a second run for peak memory (tracemalloc skews timings)"""
+    start = time.perf_counter()
+    result = func(page)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10K,100K,1M,5M,20M", help="comma-separated page sizes")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="chunk size for the streaming run")
+    args = parser.parse_args()
+
+    runs = [
+        ("legacy", legacy_clean_text),
+        ("clean_text", clean_text),
+        ("streaming", lambda page: ''.join(iter_clean_text(chunked(page, args.chunk_size)))),
+    ]
+
+    print(f"{'size':>8} {'impl':>11} {'MB/s':>9} {'peak MB':>9}")
+    for label in args.sizes.split(","):
+        page = make_page(parse_size(label))
+        expected = None
+        for name, func in runs:
+            result, elapsed, peak = measure(func, page)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                sys.exit(f"Output mismatch for {name} at size {label}")
+            throughput = len(page) / (1024 * 1024) / max(elapsed, 1e-9)
+            print(f"{label:>8} {name:>11} {throughput:>9.1f} {peak / (1024 * 1024):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the template email path used when the LLM is unavailable.
+
+Job URLs are matched against url_rules.csv and rendered with the compiled
+templates and portfolio matches, as no_deps_generator.py does. Rendering
+alone is measured too, against reading the template file, matching the
+portfolio and formatting for every email as a per-request script would.
+
+    python benchmarks/bench_email_templates.py [--emails 20000]
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'web-app', 'backend', 'python'))
+
+from url_rules import get_url_rules
+from email_templates import EmailTemplates, TEMPLATES_DIR, get_email_templates
+
+URLS = [
+    "https://careers.google.com/jobs/results/123-senior-python-developer/",
+    "https://jobs.nike.com/job/R-43840",
+    "https://boards.greenhouse.io/stripe/jobs/5567?gh_jid=5567",
+    "https://www.linkedin.com/jobs/view/3791-machine-learning-engineer-at-openai",
+    "https://jobs.lever.co/acme/8f1e-frontend-engineer-react",
+    "https://example.com/careers/junior-data-analyst.html",
+    "https://jobs.example.com/devops-engineer-kubernetes-aws",
+    "https://example.org/jobs/full-stack-developer-node-react",
+]
+
+
+def job_for(rules, url):
+    """The job dict no_deps_generator.py builds from the URL rules"""
+    match = rules.match(url)
+    role = match["role"]
+    return {
+        "role": role["value"],
+        "company": match["company"]["value"] if match["company"] else "your company",
+        "level": match["level"]["value"] if match["level"] else role["level"],
+        "skills": role["skills"],
+        "focus": role["focus"],
+        "rules": match["fired"],
+    }
+
+
+def per_email_render(templates, job, url):
+    """Read the template file, match the portfolio and format, all for every email"""
+    role_id = job["rules"]["role"]
+    path = os.path.join(TEMPLATES_DIR, f"{role_id}.txt")
+    if not os.path.exists(path):
+        path = os.path.join(TEMPLATES_DIR, "default.txt")
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    projects = "\n".join(f"• {p['title']}: {p['link']}" for p in templates.match_projects(job["skills"]))
+    skills = ", ".join(job["skills"][:4])
+    return text.format(role=job["role"], company=job["company"], level=job["level"], skills=skills,
+                       focus=job["focus"] or skills, url=url, projects=projects, sender="[Your Name]")
+
+
+def rate(fn, count):
+    started = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    seconds = time.perf_counter() - started
+    return count / seconds, seconds / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=20000, help="emails rendered per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    started = time.perf_counter()
+    templates = get_email_templates()
+    rules = get_url_rules()
+    load_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    EmailTemplates.from_dir(TEMPLATES_DIR)
+    compile_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(templates.templates)} templates, {len(rules.rules)} URL rules; "
+          f"first load {load_ms:.0f}ms (templates alone {compile_ms:.1f}ms)\n")
+
+    jobs = [job_for(rules, url) for url in URLS]
+    n = len(URLS)
+
+    measurements = [
+        ("url rules + templates", lambda i: templates.render(job_for(rules, URLS[i % n]), URLS[i % n])),
+        ("templates", lambda i: templates.render(jobs[i % n], URLS[i % n])),
+        ("per-email read + match + format", lambda i: per_email_render(templates, jobs[i % n], URLS[i % n])),
+    ]
+    print(f"{'path':<32} {'emails/s':>10} {'us/email':>9}")
+    for name, fn in measurements:
+        per_second, micros = rate(fn, args.emails)
+        print(f"{name:<32} {per_second:10.0f} {micros:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark hedged LLM requests against a local fake Groq server.
+
+The fake server speaks the OpenAI-compatible chat completions API that
+ChatGroq calls, answering in ``--base-ms`` most of the time and in
+``--slow-ms`` for ``--slow-rate`` of requests. The same sequence of
+write_mail calls is run with hedging off and on, and p50/p95/p99 latency
+plus the number of duplicate requests sent are reported.
+
+    python benchmarks/bench_hedging.py [--requests 400] [--slow-rate 0.02] [--percentile 95]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+# No real key, cache or client-side limits: every call must reach the fake server
+os.environ.setdefault("GROQ_API_KEY", "gsk_benchmark")
+os.environ["LLM_CACHE_DISABLED"] = "1"
+os.environ["GROQ_RPM"] = "0"
+os.environ["GROQ_TPM"] = "0"
+
+
+def make_handler(base_delay, slow_delay, slow_rate, counter):
+    class FakeGroqHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with counter["lock"]:
+                counter["requests"] += 1
+            time.sleep(slow_delay if random.random() < slow_rate else base_delay)
+            body = json.dumps({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "llama-3.1-8b-instant",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Dear Hiring Manager, ..."},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 200, "completion_tokens": 20, "total_tokens": 220},
+            }).encode()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    return FakeGroqHandler
+
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))]
+
+
+def run(chain, requests, label, counter):
+    job = {"role": "Python Developer", "experience": "3 years", "skills": ["Python"], "description": "Build APIs"}
+    links = ["https://example.com/portfolio"]
+    before = counter["requests"]
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        chain.write_mail(job, links)
+        latencies.append(time.perf_counter() - started)
+    sent = counter["requests"] - before
+    print(
+        f"{label:<12} p50={percentile(latencies, 50) * 1000:7.1f}ms  "
+        f"p95={percentile(latencies, 95) * 1000:7.1f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.1f}ms  "
+        f"max={max(latencies) * 1000:7.1f}ms  requests_sent={sent} (+{sent - requests} hedges)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400, help="write_mail calls per run")
+    parser.add_argument("--warmup", type=int, default=50, help="calls used to fill the latency histogram")
+    parser.add_argument("--base-ms", type=float, default=50, help="normal server latency")
+    parser.add_argument("--slow-ms", type=float, default=1000, help="tail server latency")
+    parser.add_argument("--slow-rate", type=float, default=0.02, help="fraction of slow responses")
+    parser.add_argument("--percentile", type=float, default=95, help="hedge after this latency percentile")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ["LLM_HEDGE_PERCENTILE"] = str(args.percentile)
+    os.environ["LLM_HEDGE_MIN_SAMPLES"] = str(min(args.warmup, 20))
+    random.seed(args.seed)
+
+    counter = {"requests": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        make_handler(args.base_ms / 1000, args.slow_ms / 1000, args.slow_rate, counter),
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # ChatGroq reads its base URL from the environment
+    os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["LLM_MODELS"] = "llama-3.1-8b-instant"
+    from chains import Chain
+    logging.disable(logging.INFO)
+
+    chain = Chain()
+
+    print(
+        f"Fake Groq: {args.base_ms:.0f}ms normal, {args.slow_ms:.0f}ms for {args.slow_rate:.0%} of requests; "
+        f"hedging at p{args.percentile:g}"
+    )
+    chain.hedging = False
+    run(chain, args.warmup, "warmup", counter)
+    run(chain, args.requests, "no hedging", counter)
+    chain.hedging = True
+    run(chain, args.requests, "hedging", counter)
+    stats = chain.hedge_stats()
+    print(f"hedges={stats['hedges']} won_by_duplicate={stats['hedge_wins']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark Portfolio.load_portfolio ingestion throughput.
+
+Builds synthetic portfolio CSVs from 20 to 100k rows, loads each into a
+fresh ChromaDB collection and reports rows/sec. By default a cheap hashing
+embedding function is used so the numbers measure ingestion overhead; pass
+--real-embeddings to use ChromaDB's default embedding model instead.
+
+    python benchmarks/bench_portfolio_load.py [--sizes 20,1000,100000] [--real-embeddings]
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+TECHNOLOGIES = [
+    "Python", "Django", "FastAPI", "React", "Node.js", "MongoDB", "PostgreSQL", "MySQL",
+    "Angular", ".NET", "SQL Server", "Vue.js", "Ruby on Rails", "Java", "Spring Boot",
+    "Kotlin", "Swift", "Flutter", "Go", "Rust", "Docker", "Kubernetes", "AWS", "GCP",
+    "Azure", "TensorFlow", "PyTorch", "Pandas", "Redis", "Kafka", "GraphQL", "TypeScript",
+]
+
+
+class HashEmbedding:
+    """Deterministic 64-dim embedding that costs almost nothing to compute"""
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            digest = hashlib.sha512(text.encode("utf-8")).digest()
+            vectors.append([byte / 255.0 for byte in digest])
+        return vectors
+
+    def name(self):
+        return "bench-hash"
+
+
+def write_portfolio_csv(path, rows):
+    rng = random.Random(rows)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('"Techstack","Links"\n')
+        for i in range(rows):
+            stack = ", ".join(rng.sample(TECHNOLOGIES, 3))
+            f.write(f'"{stack}","https://example.com/project-{i}"\n')
+
+
+def run(sizes, real_embeddings):
+    import chromadb
+    from portfolio import Portfolio
+
+    workdir = tempfile.mkdtemp(prefix="portfolio-bench-")
+    os.chdir(workdir)
+    client = chromadb.Client()
+
+    print(f"{'rows':>8} {'seconds':>10} {'rows/sec':>12}")
+    for rows in sizes:
+        csv_path = os.path.join(workdir, f"portfolio_{rows}.csv")
+        write_portfolio_csv(csv_path, rows)
+
+        portfolio = Portfolio(csv_path)
+        name = f"bench_{rows}"
+        if real_embeddings:
+            portfolio.collection = client.create_collection(name=name)
+        else:
+            portfolio.collection = client.create_collection(name=name, embedding_function=HashEmbedding())
+        portfolio.chroma_client = client
+        portfolio.chromadb_available = True
+
+        start = time.perf_counter()
+        portfolio.load_portfolio()
+        elapsed = time.perf_counter() - start
+
+        print(f"{rows:>8} {elapsed:>10.2f} {rows / elapsed:>12.0f}")
+        client.delete_collection(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="20,100,1000,10000,100000",
+                        help="comma-separated portfolio sizes to benchmark")
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help="use ChromaDB's default embedding function")
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.real_embeddings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the per-call overhead around the email prompt.
+
+A zero-latency fake chat model stands in for Groq, so the numbers are the
+LangChain work done per call:
+
+  rebuild    PromptTemplate.from_template + ``prompt | llm`` + invoke (the old path)
+  prebuilt   invoke on the runnable Chain.pipeline() keeps
+  batch      .batch() over --batch-size inputs on the same runnable, per input
+  build only from_template + ``prompt | llm`` without invoking, i.e. the saving
+
+    python benchmarks/bench_prompt_overhead.py [--calls 2000] [--batch-size 50]
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+os.environ.setdefault("GROQ_API_KEY", "gsk_benchmark")
+os.environ["LLM_CACHE_DISABLED"] = "1"
+
+from langchain_core.prompts import PromptTemplate
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from chains import Chain, EMAIL_PROMPT
+
+
+def per_call_us(fn, calls):
+    fn()
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000, help="calls per measurement")
+    parser.add_argument("--batch-size", type=int, default=50, help="inputs per .batch() call")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    llm = FakeListChatModel(responses=["Dear Hiring Manager, ..."])
+    inputs = {
+        "job_description": str({"role": "Python Developer", "skills": ["Python", "Django"]}),
+        "link_list": ["https://example.com/python-portfolio"],
+    }
+
+    chain = Chain()
+    model = chain.router.models_for("write_mail")[0]
+    chain.llms[model] = llm
+    pipeline = chain.pipeline("write_mail", model)
+
+    def rebuild():
+        (PromptTemplate.from_template(EMAIL_PROMPT.template) | llm).invoke(inputs)
+
+    def build_only():
+        PromptTemplate.from_template(EMAIL_PROMPT.template) | llm
+
+    batch_inputs = [inputs] * args.batch_size
+    batches = max(1, args.calls // args.batch_size)
+
+    results = [
+        ("rebuild", per_call_us(rebuild, args.calls)),
+        ("prebuilt", per_call_us(lambda: pipeline.invoke(inputs), args.calls)),
+        ("batch", per_call_us(lambda: pipeline.batch(batch_inputs), batches) / args.batch_size),
+        ("build only", per_call_us(build_only, args.calls)),
+    ]
+    baseline = results[0][1]
+    print(f"{'path':<12} {'us/call':>10} {'vs rebuild':>11}")
+    for name, us in results:
+        speedup = "-" if name == "build only" else f"{baseline / us:.2f}x"
+        print(f"{name:<12} {us:10.1f} {speedup:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark local skill detection on multi-MB pages.
+
+Synthetic pages mix filler prose with aliases drawn from data/skills.csv.
+Every page size is scanned with the Aho-Corasick SkillMatcher; pages up to
+``--baseline-mb`` are also scanned the naive ways, with one word-boundary
+regex per pattern and with one big alternation regex, for comparison.
+
+    python benchmarks/bench_skill_matcher.py [--sizes 1,4,16] [--runs 3] [--baseline-mb 1]
+"""
+import os
+import re
+import csv
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+from skill_matcher import SkillMatcher
+
+VOCAB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'skills.csv')
+
+FILLER = (
+    "we are looking for an engineer to join our team and help build the platform that powers "
+    "products used by millions of customers you will work closely with product and design own "
+    "features end to end write clear documentation and review code with a focus on quality "
+    "benefits include flexible hours remote work health insurance and a learning budget"
+).split()
+
+
+def load_aliases(path):
+    """Lowercased pattern -> canonical skill, for the naive scanners"""
+    aliases = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for pattern in [row["Skill"]] + row["Aliases"].split("|"):
+                if pattern.strip():
+                    aliases.setdefault(pattern.strip().lower(), row["Skill"])
+    return aliases
+
+
+def make_page(patterns, size_mb, seed):
+    """Filler text with roughly one vocabulary alias every 40 words"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts, length = [], 0
+    while length < target:
+        words = rng.choices(FILLER, k=40)
+        words[rng.randrange(40)] = rng.choice(patterns)
+        sentence = " ".join(words).capitalize() + ". "
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def best_of(fn, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,4,16", help="comma-separated page sizes in MB")
+    parser.add_argument("--runs", type=int, default=3, help="runs per measurement; the fastest is reported")
+    parser.add_argument("--baseline-mb", type=float, default=1, help="largest page the naive scanners run on")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    matcher = SkillMatcher.from_csv(VOCAB_PATH)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Vocabulary: {len(matcher.skills)} skills, {matcher.pattern_count} patterns, built in {build_ms:.0f}ms\n")
+
+    aliases = load_aliases(VOCAB_PATH)
+    patterns = sorted(aliases)
+
+    per_pattern = [re.compile(rf"(?<![\w+#.]){re.escape(p)}(?![\w+#])", re.IGNORECASE) for p in patterns]
+    alternation = re.compile(
+        r"(?<![\w+#.])(?:" + "|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)) + r")(?![\w+#])",
+        re.IGNORECASE,
+    )
+
+    def naive_per_pattern(page):
+        return {aliases[p] for p, regex in zip(patterns, per_pattern) if regex.search(page)}
+
+    def naive_alternation(page):
+        return {aliases[m.group().lower()] for m in alternation.finditer(page) if m.group().lower() in aliases}
+
+    print(f"{'page MB':>8} {'scanner':<14} {'ms':>9} {'MB/s':>8} {'skills':>7} {'vs matcher':>11}")
+    for size in [float(s) for s in args.sizes.split(",") if s.strip()]:
+        page = make_page(patterns, size, seed=int(size * 1000))
+        mb = len(page) / (1024 * 1024)
+        seconds, found = best_of(lambda: matcher.find_skills(page), args.runs)
+        print(f"{mb:8.1f} {'aho-corasick':<14} {seconds * 1000:9.0f} {mb / seconds:8.1f} {len(found):7d} {'1.00x':>11}")
+        if size > args.baseline_mb:
+            continue
+        for name, scan in (("per-pattern re", naive_per_pattern), ("alternation re", naive_alternation)):
+            naive_seconds, naive_found = best_of(lambda: scan(page), 1)
+            print(f"{mb:8.1f} {name:<14} {naive_seconds * 1000:9.0f} {mb / naive_seconds:8.1f} "
+                  f"{len(naive_found):7d} {naive_seconds / seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
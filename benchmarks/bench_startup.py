@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark start-up time of the Python entry points.
+
+Every command is run in a fresh interpreter with ``-X importtime``; the
+median wall time and total import time over ``--runs`` runs are reported
+together with the heavy packages it loaded. The script exits non-zero if a
+command exceeds its time budget (scaled by ``--budget-scale``) or imports a
+package it must not need, e.g. Streamlit outside the Streamlit app.
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget-scale 1.0] [--only test,portfolio]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared')
+
+HEAVY_PACKAGES = ["streamlit", "chromadb", "langchain_core", "langchain_groq", "groq", "pandas", "bs4", "httpx"]
+
+# name: (argv after the interpreter, wall-time budget in ms, packages that must not be imported)
+COMMANDS = {
+    "test": (["email_api.py", "test"], 400, HEAVY_PACKAGES),
+    "portfolio": (["email_api.py", "portfolio"], 1500,
+                  ["streamlit", "chromadb", "langchain_core", "langchain_groq", "groq", "bs4", "httpx"]),
+    "usage": (["email_api.py"], 400, HEAVY_PACKAGES),
+    "import chains": (["-c", "import chains"], 4000, ["streamlit", "chromadb", "pandas"]),
+}
+
+
+def parse_importtime(stderr):
+    """Return (total import microseconds, set of top-level packages imported)"""
+    total = 0
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        packages.add(name.strip().split(".")[0])
+        # Top-level imports are not indented; their cumulative time covers everything below
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, packages
+
+
+def run_command(argv):
+    env = dict(os.environ, LLM_CACHE_DISABLED="1", PAGE_CACHE_DISABLED="1")
+    # The entry points refuse to start without a key; none of these commands call the API
+    env.setdefault("GROQ_API_KEY", "gsk_benchmark")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        cwd=SHARED_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    import_us, packages = parse_importtime(proc.stderr)
+    return wall, import_us / 1e6, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="runs per command; the median is reported")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget, e.g. for slow CI machines")
+    parser.add_argument("--only", default="", help="comma-separated subset of: " + ", ".join(COMMANDS))
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()] or list(COMMANDS)
+    failures = []
+    print(f"{'command':<16} {'wall ms':>8} {'import ms':>10} {'budget ms':>10}  heavy packages loaded")
+    for name in selected:
+        argv, budget_ms, forbidden = COMMANDS[name]
+        walls, imports, loaded = [], [], set()
+        for _ in range(args.runs):
+            wall, import_seconds, packages = run_command(argv)
+            walls.append(wall)
+            imports.append(import_seconds)
+            loaded |= packages
+        wall_ms = statistics.median(walls) * 1000
+        import_ms = statistics.median(imports) * 1000
+        budget_ms *= args.budget_scale
+        heavy = [package for package in HEAVY_PACKAGES if package in loaded]
+        print(f"{name:<16} {wall_ms:8.0f} {import_ms:10.0f} {budget_ms:10.0f}  {', '.join(heavy) or '-'}")
+
+        if wall_ms > budget_ms:
+            failures.append(f"{name}: {wall_ms:.0f}ms exceeds the {budget_ms:.0f}ms budget")
+        unexpected = [package for package in forbidden if package in loaded]
+        if unexpected:
+            failures.append(f"{name}: imports {', '.join(unexpected)}")
+
+    if failures:
+        print("\nStart-up regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll commands within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark URL rule matching as the rule table grows.
+
+The shipped url_rules.csv is padded with synthetic company rules up to each
+table size, then a fixed set of job URLs is matched with UrlRules (one pass
+over the URL tokens) and with the old approach of testing every rule's
+keywords in turn with ``keyword in url_lower``.
+
+    python benchmarks/bench_url_rules.py [--sizes 100,1000,10000] [--urls 2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'web-app', 'backend', 'python'))
+
+from url_rules import UrlRules, RULES_PATH
+
+SYLLABLES = ["ka", "zu", "mo", "ri", "ten", "vex", "lo", "dra", "qui", "nor", "pel", "sha"]
+
+URLS = [
+    "https://careers.google.com/jobs/results/123-senior-python-developer/",
+    "https://jobs.nike.com/job/R-43840",
+    "https://boards.greenhouse.io/stripe/jobs/5567?gh_jid=5567",
+    "https://www.linkedin.com/jobs/view/3791-machine-learning-engineer-at-openai",
+    "https://jobs.lever.co/acme/8f1e-frontend-engineer-react",
+    "https://example.com/careers/junior-data-analyst.html",
+    "https://jobs.example.com/associate-engineer-python",
+    "https://jobs.example.com/associate-director-data-engineering",
+    "https://jobs.example.com/associate-vice-president-technology",
+]
+
+
+def synthetic_companies(count, seed):
+    """Company rules with made-up, distinct names"""
+    rng = random.Random(seed)
+    rules, seen = [], set()
+    while len(rules) < count:
+        name = "".join(rng.choices(SYLLABLES, k=4))
+        if name in seen:
+            continue
+        seen.add(name)
+        rules.append({"id": f"synthetic-{name}", "kind": "company", "keywords": [name], "requires": [],
+                      "value": name.title(), "level": "", "skills": [], "focus": ""})
+    return rules
+
+
+def naive_match(rules, job_url):
+    """First rule of each kind with a keyword in the lowercased URL, like the old if/elif chains"""
+    url_lower = job_url.lower()
+    fired = {}
+    for rule in rules:
+        if rule["kind"] in fired or not rule["keywords"]:
+            continue
+        if any(keyword in url_lower for keyword in rule["keywords"]) and all(
+                required in url_lower for required in rule["requires"]):
+            fired[rule["kind"]] = rule["id"]
+    return fired
+
+
+def timed(fn, urls):
+    started = time.perf_counter()
+    for url in urls:
+        fn(url)
+    return (time.perf_counter() - started) / len(urls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated rule table sizes")
+    parser.add_argument("--urls", type=int, default=2000, help="URLs matched per measurement")
+    args = parser.parse_args()
+
+    shipped = UrlRules.from_csv(RULES_PATH).rules
+    urls = (URLS * (args.urls // len(URLS) + 1))[:args.urls]
+    print(f"Shipped table: {len(shipped)} rules\n")
+
+    print(f"{'rules':>7} {'phrases':>8} {'build ms':>9} {'automaton us/url':>17} {'naive us/url':>13} {'speed-up':>9}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        table = shipped + synthetic_companies(max(0, size - len(shipped)), seed=size)
+        started = time.perf_counter()
+        rules = UrlRules(table)
+        build_ms = (time.perf_counter() - started) * 1000
+        automaton_us = timed(rules.match, urls)
+        naive_us = timed(lambda url: naive_match(rules.rules, url), urls)
+        print(f"{len(rules.rules):7d} {rules.phrase_count:8d} {build_ms:9.0f} {automaton_us:17.1f} "
+              f"{naive_us:13.1f} {naive_us / automaton_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
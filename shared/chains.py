@@ -1,4 +1,11 @@
 import os
+import re
+import sys
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from langchain_groq import ChatGroq as _ChatGroq
 # Patch ChatGroq to ignore unsupported 'proxies' argument from environment
 class ChatGroq(_ChatGroq):
@@ -6,11 +13,19 @@ class ChatGroq(_ChatGroq):
         # Accept and ignore 'proxies' parameter to match base signature
         super().__init__(*args, **kwargs)
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.exceptions import OutputParserException
 from dotenv import load_dotenv
 import logging
 
+from llm_cache import LLMCache
+from utils import estimate_tokens, split_text
+from rate_limiter import get_rate_limiter
+from llm_retry import RetryPolicy, log_llm_call
+from latency import LatencyTracker
+from model_router import ModelRouter
+from groq_client import get_http_client
+from llm_json import parse_json_lenient
+
 # Load environment variables
 # Try to find .env file in streamlit-app directory
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'streamlit-app', '.env')
@@ -23,7 +38,94 @@ else:
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
-import streamlit as st
+# Pages above this many estimated tokens are extracted chunk by chunk
+EXTRACT_CHUNK_TOKENS = int(os.getenv("EXTRACT_CHUNK_TOKENS", "4000"))
+EXTRACT_CHUNK_OVERLAP = int(os.getenv("EXTRACT_CHUNK_OVERLAP", "200"))
+EXTRACT_MAX_CONCURRENCY = int(os.getenv("EXTRACT_MAX_CONCURRENCY", "4"))
+
+# Expected completion size, counted against the tokens/min budget up front
+RESPONSE_TOKEN_ESTIMATE = 500
+
+# Hedging: if a call is slower than this percentile of recent latencies for
+# its operation, send a duplicate and take whichever answers first
+HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Ask the provider for a JSON object (response_format) when extracting jobs
+JSON_MODE = os.getenv("LLM_JSON_MODE", "1").lower() in ("1", "true", "yes")
+
+# Process-wide rolling latencies per operation and model, fed by every Chain
+LATENCY = LatencyTracker()
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_HEDGE_THREADS", "16")), thread_name_prefix="llm-hedge"
+)
+
+
+# Prompts are parsed once at import; Chain reuses them for every call
+EXTRACT_PROMPT = PromptTemplate.from_template(
+    """
+            ### SCRAPED TEXT FROM WEBSITE:
+            {page_data}
+            ### INSTRUCTION:
+            The scraped text is from the career's page of a website.
+            Your job is to extract the job postings and return them in JSON format containing the following keys:
+            `role`, `experience`, `skills`, and `description`.
+            Only return valid JSON. No preamble or explanations.
+            ### VALID JSON FORMAT (NO PREAMBLE):
+            """
+)
+
+EMAIL_PROMPT = PromptTemplate.from_template(
+    """
+            ### JOB DESCRIPTION:
+            {job_description}
+
+            ### INSTRUCTION:
+            You are Trivickram, a business development executive at AtliQ. AtliQ is an AI & Software Consulting company dedicated to facilitating
+            the seamless integration of business processes through automated tools. 
+            Over our experience, we have empowered numerous enterprises with tailored solutions, fostering scalability, 
+            process optimization, cost reduction, and heightened overall efficiency. 
+            Your job is to write a cold email to the client regarding the job mentioned above describing the capability of AtliQ 
+            in fulfilling their needs.
+            Also add the most relevant ones from the following links to showcase AtliQ's portfolio: {link_list}
+            Remember you are Trivickram, BDE at AtliQ. 
+            Do not provide a preamble.
+            ### EMAIL (NO PREAMBLE):
+
+            """
+)
+
+# JSON mode only accepts an object at the top level, so the postings are wrapped
+EXTRACT_JSON_PROMPT = PromptTemplate.from_template(
+    EXTRACT_PROMPT.template.replace(
+        "### VALID JSON FORMAT (NO PREAMBLE):",
+        'Return a JSON object of the form {{"jobs": [...]}}.\n            ### VALID JSON FORMAT (NO PREAMBLE):',
+    )
+)
+
+PROMPTS = {"extract_jobs": EXTRACT_PROMPT, "write_mail": EMAIL_PROMPT}
+
+
+def _failed_generation(error):
+    """Return the raw output Groq attaches when a JSON-mode response fails validation"""
+    body = getattr(error, "body", None)
+    if isinstance(body, dict):
+        details = body.get("error", body)
+        if isinstance(details, dict) and isinstance(details.get("failed_generation"), str):
+            return details["failed_generation"]
+    return None
+
+
+def _streamlit():
+    """
+    Return the streamlit module when running inside the Streamlit app, else None.
+
+    Streamlit is never imported here: the app has already loaded it, and the
+    Node bridge and CLI entry points should not pay for it.
+    """
+    return sys.modules.get("streamlit")
+
 
 class Chain:
     def __init__(self):
@@ -31,6 +133,7 @@ class Chain:
         # Initialize the LLM with the required API key
         
         # Try to get API key from Streamlit secrets first, then environment
+        st = _streamlit()
         groq_api_key = None
         try:
             groq_api_key = st.secrets["GROQ_API_KEY"]
@@ -41,91 +144,548 @@ class Chain:
             
         if not groq_api_key or groq_api_key.strip() == "":
             logging.critical("GROQ_API_KEY is not set. Please add it to your environment variables or Streamlit secrets.")
-            st.error("❌ GROQ_API_KEY is not configured. Please contact the administrator.")
+            if st is not None:
+                st.error("❌ GROQ_API_KEY is not configured. Please contact the administrator.")
             raise EnvironmentError("GROQ_API_KEY is missing. Please get a free API key from https://console.groq.com/keys")
 
         if groq_api_key.strip() == "your_api_key_here":
             logging.critical("Please replace 'your_api_key_here' with your actual Groq API key")
-            st.error("❌ Please configure a valid GROQ_API_KEY")
+            if st is not None:
+                st.error("❌ Please configure a valid GROQ_API_KEY")
             raise EnvironmentError("Please set a valid GROQ_API_KEY in the .env file")
 
+        # Cache LLM responses; prompts run at temperature=0 so repeats are identical
+        self.cache = LLMCache.from_env()
+        # Shared across every Chain in the process so all calls respect one budget
+        self.rate_limiter = get_rate_limiter()
+        # Chain owns retries, so the SDK's own retry loop is disabled below
+        self.retry_policy = RetryPolicy.from_env()
+        self.hedging = HEDGE_ENABLED
+        self.hedges = 0
+        self.hedge_wins = 0
+        # Hedge and parse counters are updated from many threads (serve worker, chunked extraction)
+        self._counter_lock = threading.Lock()
+
+        # Ranked models per operation with health tracking; failover happens per call
+        self.router = ModelRouter.from_env(latency=LATENCY)
+        self._groq_api_key = groq_api_key
+        self.llms = {}
+        self._pipelines = {}
+        self.json_mode = JSON_MODE
+        self.prompts = dict(PROMPTS, extract_jobs=EXTRACT_JSON_PROMPT) if self.json_mode else dict(PROMPTS)
+        self.parse_counts = {"clean": 0, "repaired": 0, "failed": 0}
+
         try:
-            self.llm = ChatGroq(
-                temperature=0, 
-                groq_api_key=groq_api_key, 
-                model_name="llama-3.1-8b-instant",  # Updated to current model
-                timeout=60  # Increase timeout
-            )
-            logging.info("Chain initialized successfully with the LLM.")
-            
+            self.llm = self._llm_for(self.router.models[0])
+            logging.info(f"Chain initialized successfully with the LLM (models: {', '.join(self.router.all_models())}).")
         except Exception as e:
             logging.error(f"Failed to initialize LLM: {e}")
             if "401" in str(e) or "authentication" in str(e).lower():
                 raise EnvironmentError(f"Invalid Groq API key. Please check your API key at https://console.groq.com/keys. Error: {e}")
-            if "decommissioned" in str(e).lower() or "model" in str(e).lower():
-                # Try fallback models
-                fallback_models = [
-                    "llama3-70b-8192", 
-                    "mixtral-8x7b-32768",
-                    "gemma-7b-it",
-                    "llama3-8b-8192"
-                ]
-                
-                for model in fallback_models:
-                    try:
-                        logging.info(f"Trying fallback model: {model}")
-                        self.llm = ChatGroq(
-                            temperature=0,
-                            groq_api_key=groq_api_key,
-                            model_name=model,
-                            timeout=60
-                        )
-                        logging.info(f"Successfully initialized with fallback model: {model}")
-                        return
-                    except Exception as fallback_error:
-                        logging.warning(f"Fallback model {model} failed: {fallback_error}")
-                        continue
-                
-                raise EnvironmentError("All available models failed. Please check Groq documentation for current models.")
             raise EnvironmentError(f"Failed to initialize LLM: {e}")
 
+    def _llm_for(self, model):
+        """Return the ChatGroq client for ``model``, creating it on first use"""
+        llm = self.llms.get(model)
+        if llm is None:
+            llm = self.llms[model] = ChatGroq(
+                temperature=0,
+                groq_api_key=self._groq_api_key,
+                model_name=model,
+                timeout=60,
+                max_retries=0,
+                # One keep-alive pool for every model and Chain in the process
+                http_client=get_http_client()
+            )
+        return llm
+
+    def pipeline(self, operation, model=None):
+        """
+        Return the prebuilt ``prompt | llm`` runnable for an operation.
+
+        ``operation`` is "extract_jobs" or "write_mail"; ``model`` defaults to
+        the router's current first choice. Runnables are built once per
+        model and reused, so batch callers can run ``.batch()`` over many
+        input dicts directly. Calls made that way skip the cache, rate
+        limiter and failover.
+        """
+        if model is None:
+            model = self.router.order(operation)[0]
+        runnable = self._pipelines.get((operation, model))
+        if runnable is None:
+            llm = self._llm_for(model)
+            if operation == "extract_jobs" and self.json_mode:
+                llm = llm.bind(response_format={"type": "json_object"})
+            runnable = self._pipelines[(operation, model)] = self.prompts[operation] | llm
+        return runnable
+
+    def _parse_jobs(self, content, count=True):
+        """
+        Parse extraction output into a list of job dicts.
+
+        Fenced, prefixed or truncated JSON is repaired locally instead of
+        failing the call; ``count`` records the outcome in ``parse_counts``.
+        """
+        try:
+            jobs, repaired = parse_json_lenient(content)
+        except ValueError as e:
+            if count:
+                with self._counter_lock:
+                    self.parse_counts["failed"] += 1
+            raise OutputParserException(f"Invalid json output: {e}", llm_output=content)
+        if count:
+            with self._counter_lock:
+                self.parse_counts["repaired" if repaired else "clean"] += 1
+        if repaired:
+            logging.warning("Extraction output was not clean JSON; repaired it locally.")
+
+        # Unwrap a lone container key such as {"jobs": [...]} or {"position": {...}}
+        if isinstance(jobs, dict) and len(jobs) == 1:
+            (inner,) = jobs.values()
+            if isinstance(inner, dict) or (isinstance(inner, list) and all(isinstance(job, dict) for job in inner)):
+                jobs = inner
+        if not isinstance(jobs, list):
+            jobs = [jobs]
+        # Cut-off output can end in an empty object
+        jobs = [job for job in jobs if job]
+
+        logging.info(f"Successfully extracted {len(jobs)} job postings.")
+        return jobs
+
+    def parse_stats(self):
+        """Return extraction parse outcomes; ``repaired`` calls would have been lost before"""
+        with self._counter_lock:
+            counts = dict(self.parse_counts)
+        total = sum(counts.values())
+        counts["failure_rate"] = round(counts["failed"] / total, 4) if total else 0.0
+        counts["repair_rate"] = round(counts["repaired"] / total, 4) if total else 0.0
+        return counts
+
+    def _cache_key(self, operation, prompt, inputs):
+        """Key a request by the operation's model list, rendered prompt and sampling params"""
+        if self.cache is None:
+            return None
+        params = {
+            "temperature": getattr(self.llm, "temperature", None),
+            "max_tokens": getattr(self.llm, "max_tokens", None),
+        }
+        models = ",".join(self.router.models_for(operation))
+        return LLMCache.make_key(models, prompt.format(**inputs), params)
+
+    def _cache_get(self, key):
+        return None if key is None else self.cache.get(key)
+
+    def _cache_set(self, key, value):
+        if key is not None and value:
+            self.cache.set(key, value)
+
+    def cache_stats(self):
+        """Return LLM cache hit/miss counters, or None when caching is disabled"""
+        return None if self.cache is None else self.cache.stats()
+
+    @staticmethod
+    def _request_tokens(prompt, inputs):
+        return estimate_tokens(prompt.format(**inputs)) + RESPONSE_TOKEN_ESTIMATE
+
+    def _retry_or_raise(self, operation, error, attempt, started):
+        """Return the delay before the next attempt, or log the call as failed and re-raise"""
+        decision = self.retry_policy.next_delay(error, attempt, started)
+        if decision is None:
+            log_llm_call(operation, attempt + 1, time.monotonic() - started, False)
+            raise error
+        delay, retry_after = decision
+        if retry_after is not None:
+            # The limiter applies the pause to every caller, including this one
+            self.rate_limiter.penalize(retry_after)
+            return 0.0
+        logging.warning(f"{operation} attempt {attempt + 1} failed ({error}); retrying in {delay:.2f}s")
+        return delay
+
+    def _hedge_delay(self, key):
+        """Seconds to wait before hedging, or None while hedging is off or untrained"""
+        if not self.hedging or LATENCY.count(key) < HEDGE_MIN_SAMPLES:
+            return None
+        return LATENCY.percentile(key, HEDGE_PERCENTILE)
+
+    def _count_hedge(self, won=False):
+        with self._counter_lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges += 1
+
+    def _call_llm(self, operation, model, prompt, inputs, tokens):
+        """
+        Send one request, hedging it when enabled.
+
+        Only the primary request's own latency is recorded, so hedging does
+        not drag the percentile it is driven by downwards. A duplicate is
+        sent only if the rate limiter has spare capacity right now.
+
+        A thread cannot be interrupted, so the losing request is not
+        cancelled: it runs to completion and its result is discarded. Its
+        rate-limiter reservation is kept, because the provider counts it.
+        """
+        runnable = self.pipeline(operation, model)
+        key = self.router.latency_key(operation, model)
+        started = time.monotonic()
+        delay = self._hedge_delay(key)
+        if delay is None:
+            result = runnable.invoke(inputs)
+            LATENCY.record(key, time.monotonic() - started)
+            return result
+
+        def record_primary(future):
+            if not future.cancelled() and future.exception() is None:
+                LATENCY.record(key, time.monotonic() - started)
+
+        primary = _hedge_executor.submit(runnable.invoke, inputs)
+        primary.add_done_callback(record_primary)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.rate_limiter.try_acquire(tokens):
+            return primary.result()
+
+        self._count_hedge()
+        backup = _hedge_executor.submit(runnable.invoke, inputs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count_hedge(won=True)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def _acall_llm(self, operation, model, prompt, inputs, tokens):
+        """Async variant of _call_llm; the losing request is cancelled"""
+        runnable = self.pipeline(operation, model)
+        key = self.router.latency_key(operation, model)
+        started = time.monotonic()
+        delay = self._hedge_delay(key)
+        if delay is None:
+            result = await runnable.ainvoke(inputs)
+            LATENCY.record(key, time.monotonic() - started)
+            return result
+
+        def record_primary(task):
+            # A cancelled primary was at least this slow, which is what the percentile needs
+            if task.cancelled() or task.exception() is None:
+                LATENCY.record(key, time.monotonic() - started)
+
+        primary = asyncio.ensure_future(runnable.ainvoke(inputs))
+        primary.add_done_callback(record_primary)
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.rate_limiter.try_acquire(tokens):
+            return await primary
+
+        self._count_hedge()
+        backup = asyncio.ensure_future(runnable.ainvoke(inputs))
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is backup:
+                        self._count_hedge(won=True)
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    def hedge_stats(self):
+        """Return hedge counters and the rolling latency percentiles they are based on"""
+        with self._counter_lock:
+            hedges, hedge_wins = self.hedges, self.hedge_wins
+        return {
+            "enabled": self.hedging,
+            "hedges": hedges,
+            "hedge_wins": hedge_wins,
+            "latency": LATENCY.summary(),
+        }
+
+    def _next_model(self, operation, tried):
+        """Pick the best model for this call that has not failed it yet"""
+        order = self.router.order(operation)
+        for model in order:
+            if model not in tried:
+                return model
+        # Every model failed once; go round again under the retry policy
+        tried.clear()
+        return order[0]
+
+    def _failover_or_retry(self, operation, model, error, attempt, started, tried):
+        """
+        Record a failed call and return the delay before the next attempt.
+
+        A model the provider rejects outright is skipped without waiting
+        while another model remains; other failures go through the retry
+        policy, and the retry prefers a model that has not failed yet.
+        """
+        tried.add(model)
+        if self.router.record_failure(model, error):
+            if any(m not in tried for m in self.router.order(operation)):
+                logging.warning(f"{operation}: model {model} unavailable ({error}); failing over")
+                return 0.0
+            log_llm_call(operation, attempt + 1, time.monotonic() - started, False, model=model)
+            raise error
+        return self._retry_or_raise(operation, error, attempt, started)
+
+    def _invoke(self, operation, prompt, inputs):
+        """Invoke ``prompt`` on the routed model, failing over and retrying transient failures"""
+        tokens = self._request_tokens(prompt, inputs)
+        started = time.monotonic()
+        attempt = 0
+        tried = set()
+        while True:
+            model = self._next_model(operation, tried)
+            self.rate_limiter.acquire(tokens)
+            try:
+                result = self._call_llm(operation, model, prompt, inputs, tokens)
+                self.router.record_success(model)
+                log_llm_call(operation, attempt + 1, time.monotonic() - started, True, model=model)
+                return result
+            except Exception as e:
+                time.sleep(self._failover_or_retry(operation, model, e, attempt, started, tried))
+            attempt += 1
+
+    async def _ainvoke(self, operation, prompt, inputs):
+        """Async variant of _invoke"""
+        tokens = self._request_tokens(prompt, inputs)
+        started = time.monotonic()
+        attempt = 0
+        tried = set()
+        while True:
+            model = self._next_model(operation, tried)
+            await self.rate_limiter.aacquire(tokens)
+            try:
+                result = await self._acall_llm(operation, model, prompt, inputs, tokens)
+                self.router.record_success(model)
+                log_llm_call(operation, attempt + 1, time.monotonic() - started, True, model=model)
+                return result
+            except Exception as e:
+                await asyncio.sleep(self._failover_or_retry(operation, model, e, attempt, started, tried))
+            attempt += 1
+
+    def _stream(self, operation, prompt, inputs):
+        """
+        Stream like _invoke; failures are only retried or failed over before the first chunk.
+
+        Time to first token is recorded under its own ``<operation>:ttft``
+        key, timed from when the attempt passes the rate limiter, so it
+        feeds neither the hedge delay nor latency routing, which read
+        full-completion times.
+        """
+        tokens = self._request_tokens(prompt, inputs)
+        started = time.monotonic()
+        attempt = 0
+        tried = set()
+        while True:
+            model = self._next_model(operation, tried)
+            self.rate_limiter.acquire(tokens)
+            attempt_started = time.monotonic()
+            streamed = False
+            try:
+                for chunk in self.pipeline(operation, model).stream(inputs):
+                    if not streamed:
+                        streamed = True
+                        LATENCY.record(
+                            self.router.latency_key(f"{operation}:ttft", model), time.monotonic() - attempt_started
+                        )
+                    yield chunk
+                self.router.record_success(model)
+                log_llm_call(operation, attempt + 1, time.monotonic() - started, True, model=model)
+                return
+            except Exception as e:
+                if streamed:
+                    self.router.record_failure(model, e)
+                    log_llm_call(operation, attempt + 1, time.monotonic() - started, False, model=model)
+                    raise
+                time.sleep(self._failover_or_retry(operation, model, e, attempt, started, tried))
+            attempt += 1
+
+    def model_stats(self):
+        """Return per-model health and the current route for each operation"""
+        return self.router.stats()
+
+    def rate_limit_stats(self):
+        """Return how often calls were queued by the client-side rate limiter"""
+        return self.rate_limiter.stats()
+
+    @staticmethod
+    def _raise_llm_error(e):
+        """Translate authentication and rate-limit failures into user-facing errors"""
+        if "401" in str(e) or "authentication" in str(e).lower():
+            raise EnvironmentError("API Authentication failed. Please check your Groq API key.")
+        if "rate" in str(e).lower() and "limit" in str(e).lower():
+            raise Exception("Rate limit exceeded. Please wait a moment and try again.")
+
+    @staticmethod
+    def _job_key(job):
+        """Normalized role, or without a role the description opening"""
+        role = re.sub(r'[^a-z0-9]+', ' ', str(job.get('role') or '').lower()).strip()
+        return role or str(job.get('description') or '')[:80].lower()
+
+    @staticmethod
+    def _merge_job(existing, job):
+        """Union skills in order and keep the longest description and first non-empty experience"""
+        skills = existing.get('skills') or []
+        if isinstance(skills, str):
+            skills = [skills]
+        new_skills = job.get('skills') or []
+        if isinstance(new_skills, str):
+            new_skills = [new_skills]
+        existing['skills'] = list(dict.fromkeys(list(skills) + list(new_skills)))
+        if len(str(job.get('description') or '')) > len(str(existing.get('description') or '')):
+            existing['description'] = job.get('description')
+        if not existing.get('experience') and job.get('experience'):
+            existing['experience'] = job.get('experience')
+
+    @classmethod
+    def _merge_jobs(cls, job_lists):
+        """
+        Merge postings extracted from overlapping chunks.
+
+        ``job_lists`` holds each chunk's postings in page order, with None
+        for a chunk that failed. Only a posting cut by a chunk boundary shows
+        up twice, as the last of its role in one chunk and the first of that
+        role in the next, so just those pairs are merged. Postings that share
+        a role anywhere else, including inside one chunk, are kept apart.
+        """
+        merged = []
+        previous = {}
+        for jobs in job_lists:
+            current = {}
+            for job in jobs or []:
+                if not isinstance(job, dict):
+                    continue
+                key = cls._job_key(job)
+                if key in previous and key not in current:
+                    target = previous[key]
+                    cls._merge_job(target, job)
+                else:
+                    target = dict(job)
+                    merged.append(target)
+                current[key] = target
+            previous = current
+        return merged
+
+    def _extract_chunks(self, cleaned_text):
+        chunks = split_text(cleaned_text, EXTRACT_CHUNK_TOKENS, EXTRACT_CHUNK_OVERLAP)
+        logging.info(
+            f"Page is ~{estimate_tokens(cleaned_text)} tokens; extracting from {len(chunks)} chunks."
+        )
+        return chunks
+
+    def _reduce_chunk_results(self, results):
+        # Failed chunks stay in place as None so only neighbouring chunks are merged
+        job_lists = [None if isinstance(result, BaseException) else result for result in results]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        if errors:
+            logging.warning(f"{len(errors)} of {len(results)} extraction chunks failed: {errors[0]}")
+        jobs = self._merge_jobs(job_lists)
+        logging.info(f"Merged {sum(len(jobs or []) for jobs in job_lists)} chunk postings into {len(jobs)} jobs.")
+        return jobs
+
     def extract_jobs(self, cleaned_text):
         """
         Extract job postings from cleaned text.
         Returns a list of jobs in JSON format.
+
+        Pages larger than EXTRACT_CHUNK_TOKENS (by local token estimate) are
+        split into overlapping chunks that are extracted in parallel and
+        merged; smaller pages use a single call.
         """
-        prompt_extract = PromptTemplate.from_template(
-            """
-            ### SCRAPED TEXT FROM WEBSITE:
-            {page_data}
-            ### INSTRUCTION:
-            The scraped text is from the career's page of a website.
-            Your job is to extract the job postings and return them in JSON format containing the following keys:
-            `role`, `experience`, `skills`, and `description`.
-            Only return valid JSON. No preamble or explanations.
-            ### VALID JSON FORMAT (NO PREAMBLE):
-            """
-        )
+        if estimate_tokens(cleaned_text) <= EXTRACT_CHUNK_TOKENS:
+            return self._extract_jobs_single(cleaned_text)
+
+        chunks = self._extract_chunks(cleaned_text)
+
+        def run(chunk):
+            try:
+                return self._extract_jobs_single(chunk)
+            except Exception as e:
+                return e
+
+        # Run each chunk in a copy of this context so call metrics are still recorded
+        contexts = [contextvars.copy_context() for _ in chunks]
+        with ThreadPoolExecutor(max_workers=min(EXTRACT_MAX_CONCURRENCY, len(chunks))) as executor:
+            results = list(executor.map(lambda context, chunk: context.run(run, chunk), contexts, chunks))
+        return self._reduce_chunk_results(results)
+
+    async def aextract_jobs(self, cleaned_text):
+        """
+        Async variant of extract_jobs built on ``ainvoke``.
+        """
+        if estimate_tokens(cleaned_text) <= EXTRACT_CHUNK_TOKENS:
+            return await self._aextract_jobs_single(cleaned_text)
+
+        chunks = self._extract_chunks(cleaned_text)
+        semaphore = asyncio.Semaphore(EXTRACT_MAX_CONCURRENCY)
+
+        async def run(chunk):
+            async with semaphore:
+                return await self._aextract_jobs_single(chunk)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
+        return self._reduce_chunk_results(results)
+
+    def _extract_jobs_single(self, cleaned_text):
+        """Extract job postings with one LLM call"""
         try:
-            chain_extract = prompt_extract | self.llm
-            res = chain_extract.invoke(input={"page_data": cleaned_text})
+            prompt_extract = self.prompts["extract_jobs"]
+            inputs = {"page_data": cleaned_text}
+            key = self._cache_key("extract_jobs", prompt_extract, inputs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return self._parse_jobs(cached, count=False)
 
-            json_parser = JsonOutputParser()
-            jobs = json_parser.parse(res.content)
+            res = self._invoke("extract_jobs", prompt_extract, inputs)
+            jobs = self._parse_jobs(res.content)
+            # Only cache responses that parsed, so a bad answer is not replayed
+            self._cache_set(key, res.content)
+            return jobs
+        except OutputParserException as e:
+            logging.error("Error parsing the job postings JSON. Ensure the text is correctly formatted.")
+            raise OutputParserException("Error parsing job postings JSON.") from e
+        except Exception as e:
+            failed = _failed_generation(e)
+            if failed is not None:
+                # JSON mode rejected the output, but it is usually one repair away
+                return self._parse_jobs(failed)
+            self._raise_llm_error(e)
+            logging.exception("An unexpected error occurred during job extraction.")
+            raise e
 
-            if not isinstance(jobs, list):
-                jobs = [jobs]
+    async def _aextract_jobs_single(self, cleaned_text):
+        """Async variant of _extract_jobs_single"""
+        try:
+            prompt_extract = self.prompts["extract_jobs"]
+            inputs = {"page_data": cleaned_text}
+            key = self._cache_key("extract_jobs", prompt_extract, inputs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return self._parse_jobs(cached, count=False)
 
-            logging.info(f"Successfully extracted {len(jobs)} job postings.")
+            res = await self._ainvoke("extract_jobs", prompt_extract, inputs)
+            jobs = self._parse_jobs(res.content)
+            self._cache_set(key, res.content)
             return jobs
         except OutputParserException as e:
             logging.error("Error parsing the job postings JSON. Ensure the text is correctly formatted.")
             raise OutputParserException("Error parsing job postings JSON.") from e
         except Exception as e:
-            if "401" in str(e) or "authentication" in str(e).lower():
-                raise EnvironmentError("API Authentication failed. Please check your Groq API key.")
-            if "rate" in str(e).lower() and "limit" in str(e).lower():
-                raise Exception("Rate limit exceeded. Please wait a moment and try again.")
+            failed = _failed_generation(e)
+            if failed is not None:
+                # JSON mode rejected the output, but it is usually one repair away
+                return self._parse_jobs(failed)
+            self._raise_llm_error(e)
             logging.exception("An unexpected error occurred during job extraction.")
             raise e
 
@@ -133,38 +693,97 @@ class Chain:
         """
         Generate a cold email for a given job description and portfolio links.
         """
-        prompt_email = PromptTemplate.from_template(
-            """
-            ### JOB DESCRIPTION:
-            {job_description}
+        try:
+            prompt_email = self.prompts["write_mail"]
+            inputs = {"job_description": str(job), "link_list": links}
+            key = self._cache_key("write_mail", prompt_email, inputs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logging.info("Email served from cache.")
+                return cached
 
-            ### INSTRUCTION:
-            You are Trivickram, a business development executive at AtliQ. AtliQ is an AI & Software Consulting company dedicated to facilitating
-            the seamless integration of business processes through automated tools. 
-            Over our experience, we have empowered numerous enterprises with tailored solutions, fostering scalability, 
-            process optimization, cost reduction, and heightened overall efficiency. 
-            Your job is to write a cold email to the client regarding the job mentioned above describing the capability of AtliQ 
-            in fulfilling their needs.
-            Also add the most relevant ones from the following links to showcase AtliQ's portfolio: {link_list}
-            Remember you are Trivickram, BDE at AtliQ. 
-            Do not provide a preamble.
-            ### EMAIL (NO PREAMBLE):
+            res = self._invoke("write_mail", prompt_email, inputs)
+            self._cache_set(key, res.content)
+            logging.info("Email generated successfully.")
+            return res.content
+        except Exception as e:
+            self._raise_llm_error(e)
+            logging.exception("Error generating the email.")
+            raise e
 
-            """
-        )
+    def write_mail_stream(self, job, links):
+        """
+        Stream a cold email token by token as the LLM produces it.
+        Yields text chunks; join them to get the same email as write_mail.
+        """
         try:
-            chain_email = prompt_email | self.llm
-            res = chain_email.invoke({"job_description": str(job), "link_list": links})
+            prompt_email = self.prompts["write_mail"]
+            inputs = {"job_description": str(job), "link_list": links}
+            key = self._cache_key("write_mail", prompt_email, inputs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logging.info("Email served from cache.")
+                yield cached
+                return
+
+            chunks = []
+            for chunk in self._stream("write_mail", prompt_email, inputs):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+            self._cache_set(key, "".join(chunks))
+            logging.info("Email streamed successfully.")
+        except Exception as e:
+            self._raise_llm_error(e)
+            logging.exception("Error streaming the email.")
+            raise e
+
+    async def awrite_mail(self, job, links):
+        """
+        Async variant of write_mail built on ``ainvoke``.
+        """
+        try:
+            prompt_email = self.prompts["write_mail"]
+            inputs = {"job_description": str(job), "link_list": links}
+            key = self._cache_key("write_mail", prompt_email, inputs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logging.info("Email served from cache.")
+                return cached
+
+            res = await self._ainvoke("write_mail", prompt_email, inputs)
+            self._cache_set(key, res.content)
             logging.info("Email generated successfully.")
             return res.content
         except Exception as e:
-            if "401" in str(e) or "authentication" in str(e).lower():
-                raise EnvironmentError("API Authentication failed. Please check your Groq API key.")
-            if "rate" in str(e).lower() and "limit" in str(e).lower():
-                raise Exception("Rate limit exceeded. Please wait a moment and try again.")
+            self._raise_llm_error(e)
             logging.exception("Error generating the email.")
             raise e
 
+    async def awrite_mails(self, jobs, portfolio, max_concurrency=5):
+        """
+        Write emails for every job concurrently.
+
+        Portfolio links for all jobs are fetched with one batched query in a
+        worker thread, and at most ``max_concurrency`` LLM calls are in flight
+        at once. Returns a list of ``{"job", "links", "email"}`` dicts in the
+        same order as ``jobs``; a failed job carries an ``error`` string
+        instead of an email.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        links_per_job = await asyncio.to_thread(
+            portfolio.query_links_batch, [job.get('skills', []) for job in jobs]
+        )
+
+        async def write_one(job, links):
+            async with semaphore:
+                try:
+                    email = await self.awrite_mail(job, links)
+                    return {"job": job, "links": links, "email": email}
+                except Exception as e:
+                    return {"job": job, "links": links, "email": None, "error": str(e)}
+
+        return await asyncio.gather(*(write_one(job, links) for job, links in zip(jobs, links_per_job)))
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,197 @@
+import os
+import re
+import logging
+
+from bs4 import BeautifulSoup
+
+from utils import clean_text, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Elements that never hold the job description
+BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "iframe", "form", "button", "nav", "aside",
+]
+
+# Page chrome, unless nested in the posting (an <article> header carries the job title)
+CHROME_TAGS = ["header", "footer"]
+
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog", "alertdialog", "search"}
+
+# id/class fragments of navigation, cookie banners, related-jobs lists and the like
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|consent|gdpr|banner|navbar|nav-|-nav|menu|breadcrumb|footer|sidebar|"
+    r"related|similar|recommend|more-jobs|other-jobs|share|social|newsletter|subscribe|"
+    r"modal|popup|promo|advert|skip-link",
+    re.IGNORECASE,
+)
+
+# id/class fragments that usually wrap the posting itself
+CONTENT_PATTERN = re.compile(
+    r"job[-_]?description|jobdescription|job[-_]?details|job[-_]?posting|posting[-_]?(body|content)|"
+    r"description|vacancy|position[-_]?details|content[-_]?body|main[-_]?content",
+    re.IGNORECASE,
+)
+
+# A region is only trusted if it keeps at least this much text
+MIN_CONTENT_CHARS = 200
+MIN_CONTENT_RATIO = 0.05
+
+
+def _attr_text(tag):
+    classes = tag.get("class") or []
+    if isinstance(classes, str):
+        classes = [classes]
+    return f"{tag.get('id') or ''} {' '.join(classes)}"
+
+
+def _strip_boilerplate(soup):
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+
+    for tag in soup(CHROME_TAGS):
+        if not tag.decomposed and tag.find_parent(["main", "article"]) is None:
+            tag.decompose()
+
+    for tag in soup.find_all(True):
+        if tag.decomposed:
+            continue
+        if tag.name in ("html", "body", "main", "article"):
+            continue
+        role = (tag.get("role") or "").lower()
+        if role in BOILERPLATE_ROLES or (tag.get("aria-hidden") == "true"):
+            tag.decompose()
+            continue
+        attrs = _attr_text(tag)
+        # Keep anything that also looks like the posting, e.g. "job-description-header"
+        if BOILERPLATE_PATTERN.search(attrs) and not CONTENT_PATTERN.search(attrs):
+            tag.decompose()
+
+
+def _text_length(tag):
+    return len(" ".join(tag.get_text(" ").split()))
+
+
+def _link_density(tag, text_length):
+    if not text_length:
+        return 1.0
+    link_chars = sum(len(" ".join(a.get_text(" ").split())) for a in tag.find_all("a"))
+    return min(1.0, link_chars / text_length)
+
+
+def _structural_candidate(soup):
+    """Return the element marked up as the posting, if the page says so"""
+    for selector in ('[itemtype*="JobPosting"]', "main", '[role="main"]', "article"):
+        tag = soup.select_one(selector)
+        if tag is not None:
+            return tag, f"structural:{selector}"
+
+    best, best_length = None, 0
+    for tag in soup.find_all(True):
+        if CONTENT_PATTERN.search(_attr_text(tag)):
+            length = _text_length(tag)
+            if length > best_length:
+                best, best_length = tag, length
+    if best is not None:
+        return best, "structural:class"
+    return None, None
+
+
+def _density_candidate(soup):
+    """
+    Readability-style scoring: every paragraph-like block scores its parent
+    (and half that for the grandparent) by text length and comma count, then
+    each container is discounted by how much of its text is link text.
+    """
+    scores = {}
+
+    def add(tag, score):
+        entry = scores.setdefault(id(tag), [tag, 0.0])
+        entry[1] += score
+
+    for block in soup.find_all(["p", "li", "pre", "td", "dd"]):
+        text = " ".join(block.get_text(" ").split())
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = block.parent
+        if parent is not None:
+            add(parent, score)
+            if parent.parent is not None:
+                add(parent.parent, score / 2)
+
+    best, best_score = None, 0
+    for tag, score in scores.values():
+        score *= 1 - _link_density(tag, _text_length(tag))
+        if score > best_score:
+            best, best_score = tag, score
+    return best
+
+
+def extract_main_content(raw_html):
+    """
+    Return ``(text, strategy)`` for the job-description region of a page.
+
+    Boilerplate (navigation, headers/footers, cookie banners, related-job
+    lists) is dropped first. The region is then chosen from structural
+    markup (JobPosting microdata, <main>, <article>, description classes)
+    or, failing that, by text density. ``text`` is None when no region
+    holds enough of the page to be trusted.
+    """
+    soup = BeautifulSoup(raw_html, "html.parser")
+    full_length = _text_length(soup)
+    _strip_boilerplate(soup)
+
+    candidate, strategy = _structural_candidate(soup)
+    if candidate is None or _text_length(candidate) < MIN_CONTENT_CHARS:
+        candidate, strategy = _density_candidate(soup), "density"
+    if candidate is None:
+        candidate, strategy = soup.body or soup, "boilerplate_stripped"
+
+    text = candidate.get_text(" ")
+    # The job title often sits in an <h1> just outside the description block
+    title = soup.find("h1")
+    if title is not None and candidate not in title.parents and title not in candidate.descendants:
+        text = title.get_text(" ") + " " + text
+    length = len(" ".join(text.split()))
+    if length < MIN_CONTENT_CHARS or length < full_length * MIN_CONTENT_RATIO:
+        return None, "full_page"
+    return text, strategy
+
+
+def extract_job_text(raw_html, cleaned_text):
+    """
+    Shrink a scraped page to its job-description region before extraction.
+
+    ``cleaned_text`` is the ``clean_text`` output for the whole page and is
+    returned unchanged when extraction is disabled (CONTENT_EXTRACTION_DISABLED)
+    or cannot find a trustworthy region. Returns ``(text, stats)`` where
+    ``stats`` reports characters and estimated tokens saved.
+    """
+    stats = {
+        "strategy": "full_page",
+        "original_chars": len(cleaned_text),
+        "original_tokens": estimate_tokens(cleaned_text),
+    }
+    text = cleaned_text
+
+    if raw_html and os.getenv("CONTENT_EXTRACTION_DISABLED", "").lower() not in ("1", "true", "yes"):
+        try:
+            region, strategy = extract_main_content(raw_html)
+            if region is not None:
+                extracted = clean_text(region)
+                if extracted:
+                    text = extracted
+                    stats["strategy"] = strategy
+        except Exception as e:
+            logger.warning(f"Main-content extraction failed, using the full page: {e}")
+
+    stats["extracted_chars"] = len(text)
+    stats["extracted_tokens"] = estimate_tokens(text)
+    stats["chars_saved"] = stats["original_chars"] - stats["extracted_chars"]
+    stats["tokens_saved"] = stats["original_tokens"] - stats["extracted_tokens"]
+    logger.info(
+        f"Content extraction ({stats['strategy']}): {stats['original_chars']} -> "
+        f"{stats['extracted_chars']} chars, ~{stats['tokens_saved']} tokens saved"
+    )
+    return text, stats
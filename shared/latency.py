@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Rolling latency histogram per key (an operation or model name).
+
+    Keeps the last ``window`` samples for each key and answers percentile
+    queries over them; thread-safe so every worker can record into one
+    process-wide tracker.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, seconds):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, key):
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def percentile(self, key, percent):
+        """Return the ``percent``-th percentile latency for ``key``, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(percent / 100 * (len(samples) - 1)))))
+        return samples[rank]
+
+    def summary(self):
+        """Return sample count, p50, p95 and p99 per key"""
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            key: {
+                "samples": self.count(key),
+                "p50": self.percentile(key, 50),
+                "p95": self.percentile(key, 95),
+                "p99": self.percentile(key, 99),
+            }
+            for key in keys
+        }
@@ -0,0 +1,192 @@
+import os
+import time
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'llm_cache.sqlite')
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses.
+
+    A bounded in-memory LRU sits in front of a SQLite store on disk. Entries
+    expire after ``ttl`` seconds and the disk store is trimmed to
+    ``max_entries`` rows (least recently used first). Keys are built with
+    ``make_key`` from the model name, the rendered prompt and the sampling
+    parameters, so only truly identical requests share a response.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_entries=256, max_entries=10000, ttl=7 * 24 * 3600):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._conn = self._connect()
+
+    @classmethod
+    def from_env(cls):
+        """Build a cache from LLM_CACHE_* environment variables, or None if disabled"""
+        if os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+            logger.info("LLM response cache disabled")
+            return None
+        return cls(
+            path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256")),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+            ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+        )
+
+    def _connect(self):
+        """Open the SQLite store; fall back to memory-only caching if that fails"""
+        if not self.path:
+            return None
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+            conn.commit()
+            return conn
+        except Exception as e:
+            logger.warning(f"LLM cache disk store unavailable: {e}. Using in-memory cache only.")
+            return None
+
+    @staticmethod
+    def make_key(model_name, prompt, params=None):
+        """Hash the model name, rendered prompt and sampling params into a cache key"""
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "params": params or {}},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for ``key`` or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        value, created_at = row
+                        if now - created_at <= self.ttl:
+                            self._conn.execute(
+                                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                            )
+                            self._conn.commit()
+                            self._remember(key, value, created_at)
+                            self.hits += 1
+                            self.disk_hits += 1
+                            return value
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache read failed: {e}")
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store ``value`` under ``key`` in both tiers"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._conn.commit()
+                self._writes += 1
+                # Evicting on every write would cost a table scan each time
+                if self._writes % 100 == 0:
+                    self._evict(now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now):
+        """Drop expired rows, then the least recently used rows above max_entries"""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        self._conn.commit()
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current sizes"""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                try:
+                    disk_entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
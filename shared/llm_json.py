@@ -0,0 +1,119 @@
+import re
+import json
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_OPEN_RE = re.compile(r"[\[{]")
+_decoder = json.JSONDecoder()
+
+# Bracket positions tried before giving up on finding complete JSON
+MAX_START_POSITIONS = 20
+
+
+def _looks_like_payload(value):
+    """An object, or a list that is empty or holds objects"""
+    if isinstance(value, dict):
+        return True
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def _close_partial(text):
+    """
+    Return repair candidates for truncated JSON, best first.
+
+    One pass drops trailing commas and tracks open brackets. The first
+    candidate closes an unterminated string and every open bracket; the
+    second cuts back to the last point where a value was complete (the
+    last comma or opening bracket) and closes from there, which drops a
+    dangling key or half-written literal.
+    """
+    out = []
+    stack = []
+    safe = None
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == ",":
+            safe = (len(out), list(stack))
+        elif ch in "[{":
+            stack.append("]" if ch == "[" else "}")
+            out.append(ch)
+            safe = (len(out), list(stack))
+            continue
+        elif ch in "]}":
+            # Tolerate "[1, 2,]"
+            while out and out[-1] in " \t\r\n,":
+                out.pop()
+            if not stack:
+                break
+            out.append(stack.pop())
+            if not stack:
+                break
+            safe = (len(out), list(stack))
+            continue
+        out.append(ch)
+
+    head = "".join(out)
+    if in_string:
+        head = (head[:-1] if escaped else head) + '"'
+    candidates = [head.rstrip().rstrip(",") + "".join(reversed(stack))]
+    if safe is not None and stack:
+        position, open_stack = safe
+        candidates.append("".join(out[:position]).rstrip().rstrip(",") + "".join(reversed(open_stack)))
+    return candidates
+
+
+def parse_json_lenient(text):
+    """
+    Parse LLM output that should be JSON but may not be clean.
+
+    Returns ``(value, repaired)``; ``repaired`` is False when the text was
+    already valid JSON. Recovers, without another LLM call, from a preamble
+    or trailing commentary, Markdown code fences, trailing commas and
+    output truncated mid-value. Raises ValueError when nothing JSON-like is
+    found.
+    """
+    text = text.strip()
+    try:
+        return json.loads(text), False
+    except ValueError:
+        pass
+
+    candidates = [match.group(1).strip() for match in _FENCE_RE.finditer(text)] + [text]
+    for candidate in candidates:
+        starts = [match.start() for match in _OPEN_RE.finditer(candidate)][:MAX_START_POSITIONS]
+        if not starts:
+            continue
+        # Valid JSON surrounded by commentary, then the same cut off mid-value
+        try:
+            value, _ = _decoder.raw_decode(candidate, starts[0])
+        except ValueError:
+            value = None
+        if _looks_like_payload(value):
+            return value, True
+        for repaired in _close_partial(candidate[starts[0]:]):
+            try:
+                value = json.loads(repaired)
+            except ValueError:
+                continue
+            if _looks_like_payload(value):
+                return value, True
+        # The first bracket was prose, e.g. "the [2] jobs below"
+        for start in starts[1:]:
+            try:
+                value, _ = _decoder.raw_decode(candidate, start)
+            except ValueError:
+                continue
+            if _looks_like_payload(value):
+                return value, True
+    raise ValueError("No JSON value found in model output")
@@ -0,0 +1,105 @@
+import os
+import time
+import random
+import logging
+import contextvars
+from contextlib import contextmanager
+
+from rate_limiter import rate_limit_retry_after
+
+logger = logging.getLogger(__name__)
+
+_TRANSIENT_NAMES = ("Timeout", "Connection", "RemoteProtocol", "ServerError", "ServiceUnavailable")
+_TRANSIENT_MESSAGES = (
+    "connection reset", "connection aborted", "connection refused", "connection error",
+    "timed out", "timeout", "server disconnected", "service unavailable", "bad gateway",
+    "gateway timeout", "internal server error", "overloaded",
+)
+
+
+def is_transient_error(error):
+    """True for failures worth retrying: 5xx, 408, 429, timeouts and dropped connections"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and (status >= 500 or status in (408, 429)):
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if any(name in type(error).__name__ for name in _TRANSIENT_NAMES):
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in _TRANSIENT_MESSAGES) or rate_limit_retry_after(error) is not None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter and a total deadline.
+
+    Attempt ``n`` (0-based) failing with a transient error sleeps a random
+    time in ``[0, min(max_delay, base_delay * 2**n)]``; rate-limit errors
+    wait for the provider's retry-after hint instead. No sleep is started
+    that would run past ``deadline`` seconds from the first attempt.
+    """
+
+    def __init__(self, max_attempts=6, base_delay=0.5, max_delay=8.0, deadline=90.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_attempts=int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "6")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8")),
+            deadline=float(os.getenv("LLM_RETRY_DEADLINE", "90")),
+        )
+
+    def next_delay(self, error, attempt, started):
+        """
+        Return ``(delay, retry_after)`` before retrying, or None to give up.
+
+        ``retry_after`` is set when the delay comes from a rate-limit hint, so
+        the caller can pause other requests too.
+        """
+        if attempt + 1 >= self.max_attempts or not is_transient_error(error):
+            return None
+        retry_after = rate_limit_retry_after(error)
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay, retry_after
+
+
+_call_log = contextvars.ContextVar("llm_call_log", default=None)
+
+
+@contextmanager
+def record_llm_calls():
+    """
+    Collect one ``{"operation", "attempts", "seconds", "success"}`` entry per
+    LLM call made inside the block (including from asyncio tasks it spawns).
+    """
+    calls = []
+    token = _call_log.set(calls)
+    try:
+        yield calls
+    finally:
+        _call_log.reset(token)
+
+
+def log_llm_call(operation, attempts, seconds, success, **extra):
+    calls = _call_log.get()
+    if calls is not None:
+        calls.append({
+            "operation": operation,
+            "attempts": attempts,
+            "seconds": round(seconds, 3),
+            "success": success,
+            **extra,
+        })
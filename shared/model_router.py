@@ -0,0 +1,159 @@
+import os
+import re
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = "llama-3.1-8b-instant,llama-3.3-70b-versatile"
+
+# Provider answers meaning "this model will not work", as opposed to "try again".
+# Only the error body counts: a bare 404 can equally come from a wrong base URL
+# or proxy path, and would otherwise take every model out of rotation in turn.
+_MODEL_ERROR_CODES = ("model_not_found", "model_decommissioned")
+_MODEL_ERROR_RE = re.compile(
+    r"\bmodel\b[^.]*?\b(?:does not exist|not found|has been decommissioned|is no longer supported)"
+)
+
+
+def is_model_error(error):
+    """True when the provider's error body rejects the model itself (unknown or retired)"""
+    message = str(error).lower()
+    return any(code in message for code in _MODEL_ERROR_CODES) or _MODEL_ERROR_RE.search(message) is not None
+
+
+def _model_list(value):
+    return [model.strip() for model in value.split(",") if model.strip()]
+
+
+class ModelRouter:
+    """
+    Chooses which model serves each LLM call.
+
+    Every operation (``extract_jobs``, ``write_mail``) has its own ranked
+    model list. A model that fails ``failure_threshold`` calls in a row is
+    taken out of rotation for ``cooldown`` seconds, and one the provider
+    rejects outright (decommissioned, unknown) for ``dead_cooldown``; after
+    that it gets a trial call and one more failure takes it out again.
+
+    With the "ranked" policy healthy models are tried in list order. With
+    "latency" they are ordered by the rolling ``percentile`` latency of that
+    model for that operation, read from a shared LatencyTracker; models with
+    fewer than ``min_samples`` calls go first so they get measured.
+    """
+
+    def __init__(self, models, operation_models=None, policy="ranked", latency=None, percentile=95,
+                 min_samples=5, failure_threshold=3, cooldown=30.0, dead_cooldown=3600.0):
+        if not models:
+            raise ValueError("ModelRouter needs at least one model")
+        self.models = list(models)
+        self.operation_models = {op: list(ms) for op, ms in (operation_models or {}).items() if ms}
+        self.policy = policy
+        self.latency = latency
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.dead_cooldown = dead_cooldown
+        self._lock = threading.Lock()
+        self._health = {}
+        for model in self.all_models():
+            self._health[model] = {"consecutive_failures": 0, "down_until": 0.0, "successes": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls, latency=None):
+        return cls(
+            models=_model_list(os.getenv("LLM_MODELS", DEFAULT_MODELS)),
+            operation_models={
+                "extract_jobs": _model_list(os.getenv("LLM_EXTRACT_MODELS", "")),
+                "write_mail": _model_list(os.getenv("LLM_EMAIL_MODELS", "")),
+            },
+            policy=os.getenv("LLM_ROUTING", "ranked").lower(),
+            latency=latency,
+            percentile=float(os.getenv("LLM_ROUTING_PERCENTILE", "95")),
+            min_samples=int(os.getenv("LLM_ROUTING_MIN_SAMPLES", "5")),
+            failure_threshold=int(os.getenv("LLM_FAILURE_THRESHOLD", "3")),
+            cooldown=float(os.getenv("LLM_FAILURE_COOLDOWN", "30")),
+            dead_cooldown=float(os.getenv("LLM_DEAD_MODEL_COOLDOWN", "3600")),
+        )
+
+    def all_models(self):
+        models = list(self.models)
+        for operation_models in self.operation_models.values():
+            models.extend(m for m in operation_models if m not in models)
+        return models
+
+    def models_for(self, operation):
+        return self.operation_models.get(operation, self.models)
+
+    @staticmethod
+    def latency_key(operation, model):
+        return f"{operation}/{model}"
+
+    def order(self, operation):
+        """Return the models to try for ``operation``, best first; never empty"""
+        models = self.models_for(operation)
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in models if self._health[m]["down_until"] <= now]
+            if not healthy:
+                # Everything is cooling down: try the one that comes back first
+                return [min(models, key=lambda m: self._health[m]["down_until"])]
+
+        if self.policy == "latency" and self.latency is not None:
+            rank = {model: i for i, model in enumerate(models)}
+
+            def score(model):
+                key = self.latency_key(operation, model)
+                if self.latency.count(key) < self.min_samples:
+                    return (0, 0.0, rank[model])
+                return (1, self.latency.percentile(key, self.percentile), rank[model])
+
+            healthy.sort(key=score)
+        return healthy
+
+    def record_success(self, model):
+        with self._lock:
+            health = self._health[model]
+            health["successes"] += 1
+            health["consecutive_failures"] = 0
+            health["down_until"] = 0.0
+
+    def record_failure(self, model, error):
+        """
+        Count a failed call; return True when the model itself was rejected and
+        the caller should move on to the next model immediately.
+        """
+        dead = is_model_error(error)
+        with self._lock:
+            health = self._health[model]
+            health["failures"] += 1
+            health["consecutive_failures"] += 1
+            if dead:
+                health["down_until"] = time.monotonic() + self.dead_cooldown
+            elif health["consecutive_failures"] >= self.failure_threshold:
+                health["down_until"] = time.monotonic() + self.cooldown
+            else:
+                return False
+        logger.warning(f"Model {model} taken out of rotation after failure: {error}")
+        return dead
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            models = {
+                model: {
+                    "healthy": health["down_until"] <= now,
+                    "consecutive_failures": health["consecutive_failures"],
+                    "successes": health["successes"],
+                    "failures": health["failures"],
+                    "down_for": round(max(0.0, health["down_until"] - now), 1),
+                }
+                for model, health in self._health.items()
+            }
+        return {
+            "policy": self.policy,
+            "routes": {op: self.order(op) for op in ["extract_jobs", "write_mail"]},
+            "models": models,
+        }
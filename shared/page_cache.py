@@ -0,0 +1,252 @@
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+
+import requests
+from bs4 import BeautifulSoup
+
+from utils import clean_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache', 'pages')
+
+# Same default header WebBaseLoader sends, so sites see the same client
+DEFAULT_HEADERS = {
+    "User-Agent": os.getenv(
+        "USER_AGENT",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    ),
+}
+
+
+def html_to_text(html):
+    """Extract page text with BeautifulSoup's get_text, as WebBaseLoader's default parsing does"""
+    return BeautifulSoup(html, "html.parser").get_text()
+
+
+def response_html(response):
+    """
+    Decode a response body. Pages served without a charset in Content-Type
+    use the detected encoding, since requests would fall back to ISO-8859-1
+    and garble UTF-8 text.
+    """
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = response.apparent_encoding
+    return response.text
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache for scraped job pages.
+
+    Raw HTML and its ``clean_text`` output are stored as blobs named by the
+    SHA-256 of the HTML, so identical pages share storage. A SQLite index
+    maps each URL to its blob plus the ETag/Last-Modified validators. Fresh
+    entries (younger than ``ttl``) are served without touching the network;
+    stale ones are revalidated with If-None-Match/If-Modified-Since. When
+    the total blob size exceeds ``max_bytes`` the least recently fetched
+    URLs are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=6 * 3600, max_bytes=512 * 1024 * 1024, timeout=30):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, 'blobs')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        """Build a cache from PAGE_CACHE_* environment variables, or None if disabled"""
+        if os.getenv("PAGE_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+            logger.info("Page cache disabled")
+            return None
+        try:
+            return cls(
+                directory=os.getenv("PAGE_CACHE_DIR", DEFAULT_CACHE_DIR),
+                ttl=float(os.getenv("PAGE_CACHE_TTL", str(6 * 3600))),
+                max_bytes=int(os.getenv("PAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Page cache unavailable: {e}. Fetching pages directly.")
+            return None
+
+    def _blob_path(self, content_hash, suffix):
+        return os.path.join(self.blob_dir, f"{content_hash}.{suffix}")
+
+    def _read_blobs(self, content_hash):
+        with open(self._blob_path(content_hash, 'html'), encoding='utf-8') as f:
+            html = f.read()
+        with open(self._blob_path(content_hash, 'txt'), encoding='utf-8') as f:
+            cleaned = f.read()
+        return html, cleaned
+
+    def _write_blobs(self, html):
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        html_path = self._blob_path(content_hash, 'html')
+        if not os.path.exists(html_path):
+            cleaned = clean_text(html_to_text(html))
+            # Write the text blob first so a present .html always has its .txt
+            for suffix, data in (('txt', cleaned), ('html', html)):
+                tmp_path = self._blob_path(content_hash, suffix) + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._blob_path(content_hash, suffix))
+        return content_hash, len(html.encode('utf-8'))
+
+    def _fetch(self, url, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def load(self, url):
+        """
+        Return ``(raw_html, cleaned_text)`` for a URL, using the cache when possible.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+
+        if row is not None:
+            content_hash, etag, last_modified, fetched_at = row
+            try:
+                cached = self._read_blobs(content_hash)
+            except OSError:
+                # Blobs were removed underneath us; refetch unconditionally
+                cached = etag = last_modified = None
+            if cached is not None and time.time() - fetched_at < self.ttl:
+                with self._lock:
+                    self.hits += 1
+                logger.info(f"Page cache hit: {url}")
+                return cached
+        else:
+            etag = last_modified = None
+            cached = None
+
+        try:
+            response = self._fetch(url, etag, last_modified)
+        except requests.RequestException as e:
+            if cached is not None:
+                logger.warning(f"Fetch failed for {url} ({e}); serving stale cached copy")
+                with self._lock:
+                    self.hits += 1
+                return cached
+            raise
+
+        now = time.time()
+        if response.status_code == 304 and cached is not None:
+            logger.info(f"Page cache revalidated: {url}")
+            with self._lock:
+                self.revalidated += 1
+                self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (now, url))
+                self._conn.commit()
+            return cached
+
+        html = response_html(response)
+        with self._lock:
+            self.misses += 1
+            content_hash, size = self._write_blobs(html)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, etag, last_modified, fetched_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, content_hash, response.headers.get("ETag"), response.headers.get("Last-Modified"), now, size),
+            )
+            self._conn.commit()
+            self._evict()
+        return self._read_blobs(content_hash)
+
+    def _evict(self):
+        """Drop least recently fetched URLs until the unique blobs fit in max_bytes"""
+        rows = self._conn.execute(
+            "SELECT url, content_hash, size FROM pages ORDER BY fetched_at ASC"
+        ).fetchall()
+        sizes = {content_hash: size for _, content_hash, size in rows}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        refs = {}
+        for _, content_hash, _ in rows:
+            refs[content_hash] = refs.get(content_hash, 0) + 1
+
+        for url, content_hash, size in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            refs[content_hash] -= 1
+            if refs[content_hash] == 0:
+                total -= size
+                for suffix in ('html', 'txt'):
+                    try:
+                        os.remove(self._blob_path(content_hash, suffix))
+                    except OSError:
+                        pass
+        self._conn.commit()
+
+    def stats(self):
+        """Return hit/revalidation/miss counters"""
+        with self._lock:
+            return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Return the process-wide PageCache (None when disabled)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PageCache.from_env() or False
+    return _default_cache or None
+
+
+def load_page(url):
+    """
+    Fetch a job page and return ``(raw_html, cleaned_text)``.
+
+    Goes through the shared PageCache when it is enabled, so repeated and
+    retried URLs skip the network entirely.
+    """
+    cache = get_page_cache()
+    if cache is not None:
+        return cache.load(url)
+
+    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=30)
+    response.raise_for_status()
+    html = response_html(response)
+    return html, clean_text(html_to_text(html))
@@ -1,37 +1,74 @@
 import pandas as pd
-import uuid
+import re
+import sys
+import importlib.util
+import heapq
+import hashlib
 import time
 import logging
 import os
 import shutil
+from collections import defaultdict
 
-# Try to import chromadb with fallback
-try:
-    # Fix SQLite version issue for ChromaDB
-    __import__('pysqlite3')
-    import sys
-    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
-except ImportError:
-    pass
-
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-    logger = logging.getLogger(__name__)
-    logger.info("ChromaDB imported successfully")
-except ImportError as e:
-    CHROMADB_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"ChromaDB not available: {e}. Portfolio matching will use simple text matching.")
-except RuntimeError as e:
-    CHROMADB_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"ChromaDB runtime error: {e}. Portfolio matching will use simple text matching.")
+logger = logging.getLogger(__name__)
+
+# chromadb takes seconds to import, so it is only loaded when a collection is first needed
+chromadb = None
+Settings = None
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
+
+
+def _import_chromadb():
+    """Import chromadb on first use; returns False if it cannot be loaded"""
+    global chromadb, Settings, CHROMADB_AVAILABLE
+    if chromadb is not None or not CHROMADB_AVAILABLE:
+        return CHROMADB_AVAILABLE
+
+    try:
+        # Fix SQLite version issue for ChromaDB
+        __import__('pysqlite3')
+        sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+    except ImportError:
+        pass
+
+    try:
+        import chromadb as _chromadb
+        from chromadb.config import Settings as _Settings
+        chromadb, Settings = _chromadb, _Settings
+        logger.info("ChromaDB imported successfully")
+    except ImportError as e:
+        CHROMADB_AVAILABLE = False
+        logger.warning(f"ChromaDB not available: {e}. Portfolio matching will use simple text matching.")
+    except RuntimeError as e:
+        CHROMADB_AVAILABLE = False
+        logger.warning(f"ChromaDB runtime error: {e}. Portfolio matching will use simple text matching.")
+    return CHROMADB_AVAILABLE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+_SKILL_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def _normalize_skill(skill):
+    """Lowercase a skill/tech name and collapse internal whitespace"""
+    return " ".join(skill.lower().split())
+
+
+def _skill_words(skill):
+    """Split a normalized skill into word tokens, keeping names like c++, c# and node.js intact"""
+    return [word.strip(".") for word in _SKILL_WORD_RE.findall(skill) if word.strip(".")]
+
+
+def _skill_list(skills):
+    """
+    The skills to query for: a single string (as the LLM sometimes returns)
+    becomes one skill, and empty entries are dropped
+    """
+    if isinstance(skills, str):
+        skills = [skills]
+    return [str(skill) for skill in (skills or []) if str(skill).strip()]
+
 
 class Portfolio:
     def __init__(self, file_path=None):
@@ -41,23 +78,41 @@ class Portfolio:
             file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'my_portfolio.csv')
         self.file_path = file_path
         self.data = pd.read_csv(file_path)
+        self._build_skill_index()
         self.vectorstore_path = 'vectorstore'
         self.chromadb_available = CHROMADB_AVAILABLE
-        
-        if self.chromadb_available:
+        # ChromaDB is connected on first use of self.collection
+        self.chroma_client = None
+        self._collection = None
+        self._chroma_connected = False
+
+    @property
+    def collection(self):
+        """The ChromaDB collection, connected on first access; None when unavailable"""
+        if not self._chroma_connected:
+            self._chroma_connected = True
+            self._connect_chroma()
+        return self._collection
+
+    @collection.setter
+    def collection(self, value):
+        self._chroma_connected = True
+        self._collection = value
+
+    def _connect_chroma(self):
+        if self.chromadb_available and _import_chromadb():
             # Initialize ChromaDB with proper error handling
             try:
                 self.chroma_client = self._initialize_chroma_client()
-                self.collection = self.chroma_client.get_or_create_collection(name="portfolio")
+                self._collection = self.chroma_client.get_or_create_collection(name="portfolio")
                 logger.info("ChromaDB initialized successfully")
             except Exception as e:
                 logger.warning(f"ChromaDB initialization failed: {e}. Falling back to simple matching.")
                 self.chromadb_available = False
                 self.chroma_client = None
-                self.collection = None
+                self._collection = None
         else:
-            self.chroma_client = None
-            self.collection = None
+            self.chromadb_available = False
             logger.info("Using fallback portfolio matching (ChromaDB not available)")
 
     def _initialize_chroma_client(self):
@@ -137,54 +192,109 @@ class Portfolio:
             logger.warning("Using in-memory ChromaDB as fallback")
             return chromadb.Client()
 
+    @staticmethod
+    def _row_id(techstack, links):
+        """Deterministic ID for a portfolio row, derived from its content"""
+        return hashlib.sha256(f"{techstack}\x1f{links}".encode("utf-8")).hexdigest()[:32]
+
+    def _portfolio_rows(self):
+        """Map content-hash ID -> (document, metadata) for every CSV row"""
+        rows = {}
+        for techstack, links in zip(self.data["Techstack"], self.data["Links"]):
+            techstack, links = str(techstack), str(links)
+            rows[self._row_id(techstack, links)] = (techstack, {"links": links})
+        return rows
+
+    def _max_batch_size(self):
+        """Largest batch the ChromaDB client accepts in one call"""
+        try:
+            return int(self.chroma_client.get_max_batch_size())
+        except Exception:
+            return 5000
+
+    def _bulk_upsert(self, ids, rows, initial_batch_size=256, target_seconds=1.0, max_retries=3):
+        """
+        Upsert rows in adaptively sized batches.
+
+        The batch size starts at ``initial_batch_size`` and is resized after
+        every call so each batch takes roughly ``target_seconds`` of embedding
+        time, bounded by the client's maximum batch size. There is no fixed
+        delay between batches; a failed batch is retried with exponential
+        backoff at half the size, and only raises after ``max_retries``
+        consecutive failures.
+        """
+        max_batch_size = self._max_batch_size()
+        batch_size = min(initial_batch_size, max_batch_size)
+        failures = 0
+        added = 0
+        start_time = time.perf_counter()
+        
+        while added < len(ids):
+            batch_ids = ids[added:added + batch_size]
+            documents = [rows[row_id][0] for row_id in batch_ids]
+            metadatas = [rows[row_id][1] for row_id in batch_ids]
+            
+            batch_start = time.perf_counter()
+            try:
+                self.collection.upsert(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=batch_ids
+                )
+            except Exception as e:
+                failures += 1
+                if failures >= max_retries:
+                    logger.error(f"Failed to add batch after {max_retries} attempts: {e}")
+                    raise
+                logger.warning(f"Batch add attempt {failures} failed, retrying with a smaller batch: {e}")
+                batch_size = max(1, batch_size // 2)
+                time.sleep(0.5 * 2 ** (failures - 1))
+                continue
+            
+            failures = 0
+            added += len(batch_ids)
+            elapsed = time.perf_counter() - batch_start
+            
+            # Resize towards the target duration, at most doubling or halving per step
+            if elapsed > 0:
+                scale = min(2.0, max(0.5, target_seconds / elapsed))
+                batch_size = max(1, min(max_batch_size, int(batch_size * scale)))
+            
+            logger.debug(f"Added {added}/{len(ids)} rows (next batch size {batch_size})")
+        
+        if ids:
+            total = time.perf_counter() - start_time
+            logger.info(f"Added {len(ids)} rows in {total:.2f}s ({len(ids) / max(total, 1e-9):.0f} rows/sec)")
+
     def load_portfolio(self):
-        """Load portfolio data into ChromaDB with retry logic"""
+        """
+        Sync the CSV into ChromaDB with retry logic.
+
+        Rows are keyed by a hash of their Techstack/Links content, so only rows
+        that were added or removed since the last load are written; an
+        unchanged CSV costs a single ID listing.
+        """
         if not self.chromadb_available or self.collection is None:
             logger.info("ChromaDB not available, portfolio data loaded from CSV only")
             return
             
         try:
-            if self.collection.count() > 0:
-                logger.info(f"Portfolio already loaded with {self.collection.count()} items")
+            rows = self._portfolio_rows()
+            existing_ids = set(self.collection.get(include=[])["ids"])
+            
+            new_ids = [row_id for row_id in rows if row_id not in existing_ids]
+            stale_ids = [row_id for row_id in existing_ids if row_id not in rows]
+            
+            if not new_ids and not stale_ids:
+                logger.info(f"Portfolio already up to date with {len(existing_ids)} items")
                 return
             
-            logger.info("Loading portfolio data into ChromaDB...")
+            logger.info(f"Syncing portfolio: {len(new_ids)} new, {len(stale_ids)} removed rows")
             
-            # Add data in batches to avoid timeout
-            batch_size = 5
-            for i in range(0, len(self.data), batch_size):
-                batch = self.data.iloc[i:i+batch_size]
-                
-                documents = []
-                metadatas = []
-                ids = []
-                
-                for _, row in batch.iterrows():
-                    documents.append(str(row["Techstack"]))
-                    metadatas.append({"links": str(row["Links"])})
-                    ids.append(str(uuid.uuid4()))
-                
-                # Add batch with retry logic
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        self.collection.add(
-                            documents=documents,
-                            metadatas=metadatas,
-                            ids=ids
-                        )
-                        logger.info(f"Added batch {i//batch_size + 1}/{(len(self.data)-1)//batch_size + 1}")
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            logger.warning(f"Batch add attempt {attempt + 1} failed, retrying: {e}")
-                            time.sleep(2)  # Wait before retry
-                        else:
-                            logger.error(f"Failed to add batch after {max_retries} attempts: {e}")
-                            raise
-                
-                # Small delay between batches
-                time.sleep(0.5)
+            if stale_ids:
+                self.collection.delete(ids=stale_ids)
+            
+            self._bulk_upsert(new_ids, rows)
             
             logger.info(f"Portfolio loaded successfully with {self.collection.count()} items")
             
@@ -194,6 +304,7 @@ class Portfolio:
 
     def query_links(self, skills):
         """Query for relevant portfolio links"""
+        skills = _skill_list(skills)
         try:
             if not skills:
                 return []
@@ -214,31 +325,96 @@ class Portfolio:
             # Fallback to simple matching
             return self._simple_skill_matching(skills)
 
-    def _simple_skill_matching(self, skills):
-        """Fallback method for portfolio matching when ChromaDB is not available"""
+    def query_links_batch(self, skill_lists, n_results=2):
+        """
+        Query portfolio links for several jobs at once.
+
+        Skill strings are deduplicated across all jobs, embedded once and sent
+        in a single vector search; the per-skill results are then scattered
+        back so entry ``i`` equals ``query_links(skill_lists[i])``.
+        """
+        skill_lists = [_skill_list(skills) for skills in skill_lists]
+        try:
+            if not self.chromadb_available or self.collection is None:
+                return [self._simple_skill_matching(skills) for skills in skill_lists]
+            
+            unique_skills = list(dict.fromkeys(skill for skills in skill_lists for skill in skills))
+            if not unique_skills:
+                return [[] for _ in skill_lists]
+            
+            if self.collection.count() == 0:
+                logger.warning("Portfolio not loaded, loading now...")
+                self.load_portfolio()
+            
+            result = self.collection.query(query_texts=unique_skills, n_results=n_results)
+            metadatas = dict(zip(unique_skills, result.get('metadatas', [])))
+            logger.info(f"Batched portfolio query: {len(unique_skills)} unique skills for {len(skill_lists)} jobs")
+            
+            return [[metadatas[skill] for skill in skills] for skills in skill_lists]
+        except Exception as e:
+            logger.error(f"Error in batched portfolio query: {e}")
+            return [self._simple_skill_matching(skills) for skills in skill_lists]
+
+    def _build_skill_index(self):
+        """
+        Build the inverted index used by the fallback matcher.
+
+        ``_tech_index`` maps each normalized Techstack entry (e.g. "node.js")
+        to the row positions containing it, and ``_word_index`` maps the
+        individual words of those entries (e.g. "rails" from "ruby on rails")
+        so partial skill names still match.
+        """
+        self._tech_index = defaultdict(set)
+        self._word_index = defaultdict(set)
+        self._row_links = []
+        
+        for position, (techstack, links) in enumerate(zip(self.data["Techstack"], self.data["Links"])):
+            self._row_links.append(str(links))
+            if pd.isna(techstack):
+                continue
+            for tech in str(techstack).split(","):
+                tech = _normalize_skill(tech)
+                if not tech:
+                    continue
+                self._tech_index[tech].add(position)
+                for word in _skill_words(tech):
+                    self._word_index[word].add(position)
+
+    def _simple_skill_matching(self, skills, n_results=2):
+        """
+        Fallback method for portfolio matching when ChromaDB is not available.
+
+        Scores every row by how many of the requested skills it covers (an
+        exact Techstack entry counts 1, a word-level match 0.5) and returns the
+        top ``n_results`` rows, ties broken by CSV order.
+        """
         try:
             if not skills:
                 return []
             
-            # Convert skills to lowercase for matching
-            skills_lower = [skill.lower() for skill in skills]
-            matches = []
-            
-            for _, row in self.data.iterrows():
-                techstack = str(row.get("Techstack", "")).lower()
-                # Check if any skill matches the techstack
-                for skill in skills_lower:
-                    if skill in techstack:
-                        matches.append({"links": str(row.get("Links", ""))})
-                        break  # Avoid duplicate entries for the same project
-                
-                # Limit to 2 matches (similar to ChromaDB query)
-                if len(matches) >= 2:
-                    break
+            if getattr(self, "_tech_index", None) is None:
+                self._build_skill_index()
+            
+            scores = defaultdict(float)
+            for skill in skills:
+                skill = _normalize_skill(str(skill))
+                if not skill:
+                    continue
+                exact = self._tech_index.get(skill, set())
+                partial = set()
+                for word in _skill_words(skill):
+                    partial |= self._word_index.get(word, set())
+                for position in exact:
+                    scores[position] += 1.0
+                for position in partial - exact:
+                    scores[position] += 0.5
+            
+            top = heapq.nlargest(n_results, scores.items(), key=lambda item: (item[1], -item[0]))
+            matches = [{"links": self._row_links[position]} for position, _ in top]
             
             logger.info(f"Simple matching found {len(matches)} portfolio matches")
             return matches
             
         except Exception as e:
             logger.error(f"Error in simple skill matching: {e}")
-            return []
\ No newline at end of file
+            return []
@@ -0,0 +1,177 @@
+import os
+import re
+import time
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Groq free-tier limits for llama-3.1-8b-instant; override per account
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 6000
+
+# How long to back off after a 429 that carries no retry-after hint
+DEFAULT_RETRY_AFTER = 5.0
+
+_RETRY_IN_RE = re.compile(r"try again in (?:(\d+)h)?(?:(\d+)m(?!s))?(?:([\d.]+)(ms|s))?", re.IGNORECASE)
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler for requests/min and tokens/min.
+
+    Callers reserve capacity up front with ``acquire`` (or ``aacquire``);
+    a bucket may go into debt, and the caller then sleeps until the refill
+    covers it, so concurrent callers queue in arrival order instead of
+    failing. ``penalize`` pauses every new reservation, e.g. for a
+    provider's retry-after hint. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.penalties = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            requests_per_minute=int(os.getenv("GROQ_RPM", str(DEFAULT_REQUESTS_PER_MINUTE))),
+            tokens_per_minute=int(os.getenv("GROQ_TPM", str(DEFAULT_TOKENS_PER_MINUTE))),
+        )
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _reserve(self, tokens):
+        """Take capacity for one request and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if self.requests_per_minute:
+                self._requests -= 1
+                if self._requests < 0:
+                    wait = max(wait, -self._requests * 60 / self.requests_per_minute)
+            if self.tokens_per_minute:
+                # A single oversized request can never fit; let it through at full-bucket cost
+                self._tokens -= min(tokens, self.tokens_per_minute)
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60 / self.tokens_per_minute)
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+            return wait
+
+    def try_acquire(self, tokens=0):
+        """Reserve capacity only if it is available right now; never waits or goes into debt"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._blocked_until:
+                return False
+            if self.requests_per_minute and self._requests < 1:
+                return False
+            tokens = min(tokens, self.tokens_per_minute)
+            if self.tokens_per_minute and self._tokens < tokens:
+                return False
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens=0):
+        """Block until a request of ``tokens`` estimated tokens may be sent"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.info(f"Rate limiter: waiting {wait:.2f}s before the next LLM call")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens=0):
+        """Async variant of acquire"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.info(f"Rate limiter: waiting {wait:.2f}s before the next LLM call")
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds):
+        """Hold back every new reservation for ``seconds``"""
+        with self._lock:
+            self.penalties += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limited by provider; pausing LLM calls for {seconds:.2f}s")
+
+    def stats(self):
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "penalties": self.penalties,
+        }
+
+
+def rate_limit_retry_after(error):
+    """
+    Return the back-off in seconds if ``error`` is a rate-limit error, else None.
+
+    Reads a ``retry-after`` header when the SDK exposes the response, then
+    Groq's "Please try again in 1m2.5s" message, and falls back to
+    DEFAULT_RETRY_AFTER. A 413 "Request too large" is not retryable even
+    though Groq tags it rate_limit_exceeded, and the message is only matched
+    for "rate limit" when the error carries no status code.
+    """
+    message = str(error)
+    status = getattr(error, "status_code", None)
+    if status == 413 or "request too large" in message.lower():
+        return None
+    if status is not None:
+        if status != 429:
+            return None
+    elif not ("rate" in message.lower() and "limit" in message.lower()):
+        return None
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        if value is not None:
+            return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    match = _RETRY_IN_RE.search(message)
+    if match and any(match.groups()):
+        hours, minutes, amount, unit = match.groups()
+        seconds = int(hours or 0) * 3600 + int(minutes or 0) * 60
+        if amount:
+            seconds += float(amount) / (1000 if unit.lower() == "ms" else 1)
+        return seconds
+
+    return DEFAULT_RETRY_AFTER
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide RateLimiter shared by every Chain"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter.from_env()
+    return _default_limiter
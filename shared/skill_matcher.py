@@ -0,0 +1,341 @@
+import os
+import re
+import csv
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Runs of word characters plus the punctuation skill names use. Most are plain
+# words and are used as they are; the rest are split by _TOKEN_RE below.
+_RAW_RE = re.compile(r"[A-Za-z0-9#+.&'\-]+")
+_SPACE_RE = re.compile(r"\s")
+
+# Word tokens. Dots inside a token keep node.js and asp.net whole and a leading
+# dot keeps .net; # and trailing + keep c#, f# and c++ apart from c and f, while
+# a + between words separates them ("Python+Django"). Hyphens separate tokens
+# too, so "scikit-learn" matches "scikit learn" and "Python-based" still finds
+# Python.
+_WORD = r"[a-z0-9#]+(?:\+(?![a-z0-9#]))*"
+_TOKEN_RE = re.compile(rf"\.?{_WORD}(?:\.{_WORD})*", re.IGNORECASE | re.ASCII)
+
+# A single letter joined to a word by one of these keeps it ("c-", "&d"), so
+# C-level, R&D and USB-C are not read as the C or R languages
+_LETTER_JOINERS = ("-", "&", "'")
+
+# Text is scanned in slices of about this many characters to bound memory
+_CHUNK_CHARS = 1 << 18
+
+# Skills kept when pre-filling a job from page text
+SKILL_PREFILL_LIMIT = int(os.getenv("SKILL_PREFILL_LIMIT", "15"))
+
+_DEFAULT_PATHS = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills.csv'),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skills.csv'),
+)
+
+
+def _split(raw):
+    """Tokens of a run that is not a plain word, in their original case"""
+    parts = []
+    for match in _TOKEN_RE.finditer(raw):
+        part = match.group()
+        if len(part) == 1:
+            start, end = match.span()
+            if raw[end:end + 1] in _LETTER_JOINERS:
+                part += raw[end]
+            elif raw[start - 1:start] in _LETTER_JOINERS:
+                part = raw[start - 1] + part
+        parts.append(part)
+    return parts
+
+
+def _tokens(text):
+    """Original-case tokens of ``text``"""
+    tokens = []
+    for raw in _RAW_RE.findall(text):
+        if raw.isalnum():
+            tokens.append(raw)
+        else:
+            tokens.extend(_split(raw))
+    return tokens
+
+
+def phrase_key(text):
+    """The lowercase token form a phrase is matched in, e.g. 'full stack' for Full-Stack"""
+    return " ".join(token.lower() for token in _tokens(text))
+
+
+def _chunks(text):
+    """Slices of ``text`` that end at whitespace, so no token is cut in two"""
+    start = 0
+    while start < len(text):
+        space = _SPACE_RE.search(text, start + _CHUNK_CHARS)
+        end = space.end() if space else len(text)
+        yield text[start:end]
+        start = end
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word-token phrases.
+
+    Phrases are tokenized the same way as the scanned text, and the
+    automaton walks tokens rather than characters, so every phrase is found
+    in one linear pass no matter how many there are, and a phrase can only
+    match whole words. Call ``compile()`` after the last ``add()``.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._dotted = set()
+        self._labels = {}
+        self.pattern_count = 0
+        self.conflicts = 0
+        self.max_tokens = 1
+
+    def add(self, pattern, label, case_sensitive=False):
+        """
+        Report ``label`` wherever ``pattern`` occurs. With ``case_sensitive``
+        a pattern written with capitals must match exactly. A phrase that
+        already belongs to another label keeps its first one.
+        """
+        exact = tuple(_tokens(pattern))
+        tokens = [token.lower() for token in exact]
+        if not tokens:
+            return
+        key = tuple(tokens)
+        if case_sensitive and pattern != pattern.lower():
+            key = (key, exact)
+        else:
+            exact = None
+        owner = self._labels.get(key)
+        if owner is not None:
+            if owner != label:
+                self.conflicts += 1
+                logger.debug(f"Phrase '{pattern}' of {label} already belongs to {owner}")
+            return
+        self._labels[key] = label
+
+        state = 0
+        for token in tokens:
+            if token.startswith("."):
+                self._dotted.add(token)
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += ((label, len(tokens), exact),)
+        self.pattern_count += 1
+
+    def compile(self):
+        """Breadth-first fail links; each state also inherits the outputs of its fail state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+        self.max_tokens = max((length for outputs in self._out for _, length, _ in outputs), default=1)
+        return self
+
+    def iter_matches(self, text):
+        """
+        Yield ``(first, last, label)`` for every phrase in ``text``,
+        overlapping ones included, where ``first`` and ``last`` are token
+        offsets (the hit covers tokens ``first`` to ``last - 1``). The text
+        is read once, in slices, however many phrases there are.
+        """
+        if not text:
+            return
+        goto, fail, out, dotted = self._goto, self._fail, self._out, self._dotted
+        root = goto[0]
+        # Original-case tokens of the current partial match, for case-sensitive patterns
+        recent = deque(maxlen=self.max_tokens)
+        state = 0
+        position = 0
+        for chunk in _chunks(text):
+            for raw in _RAW_RE.findall(chunk):
+                if raw.isalnum():
+                    if not state and raw.lower() not in root:
+                        # Most words start no phrase
+                        position += 1
+                        continue
+                    parts = (raw,)
+                else:
+                    parts = _split(raw)
+                for original in parts:
+                    position += 1
+                    token = original.lower()
+                    if token[0] == "." and token not in dotted:
+                        # An ellipsis or full stop run into the next word, e.g. "and more...Python"
+                        token = token[1:]
+                        original = original[1:]
+
+                    next_state = goto[state].get(token)
+                    if next_state is None:
+                        if not state:
+                            continue
+                        while next_state is None and state:
+                            state = fail[state]
+                            next_state = goto[state].get(token)
+                        if next_state is None:
+                            continue
+                    state = next_state
+                    recent.append(original)
+
+                    for label, length, exact in out[state]:
+                        if exact is not None and tuple(recent)[-length:] != exact:
+                            continue
+                        yield position - length, position, label
+
+
+class SkillMatcher(PhraseMatcher):
+    """
+    PhraseMatcher over a skill vocabulary, reporting canonical skill names.
+
+    ``vocabulary`` is a list of dicts with ``skill``, ``aliases``,
+    ``category`` and ``case_sensitive``. For a case-sensitive entry the
+    patterns written with capitals (Go, R, Spring) must match exactly; its
+    all-lowercase aliases (golang) match in any case. An alias two entries
+    share belongs to the first.
+    """
+
+    def __init__(self, vocabulary):
+        super().__init__()
+        self.skills = []
+        self.categories = {}
+        for entry in vocabulary:
+            skill = entry["skill"].strip()
+            if not skill or skill in self.categories:
+                continue
+            self.skills.append(skill)
+            self.categories[skill] = entry.get("category", "")
+            for pattern in [skill] + list(entry.get("aliases") or []):
+                self.add(pattern.strip(), skill, entry.get("case_sensitive", False))
+        self.compile()
+
+    @classmethod
+    def from_csv(cls, *paths):
+        """Load ``Skill,Aliases,Category,CaseSensitive`` rows; aliases are separated by ``|``"""
+        vocabulary = []
+        for path in paths:
+            with open(path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    vocabulary.append({
+                        "skill": row["Skill"],
+                        "aliases": [alias for alias in (row.get("Aliases") or "").split("|") if alias.strip()],
+                        "category": row.get("Category", ""),
+                        "case_sensitive": (row.get("CaseSensitive") or "").strip().lower() in ("1", "true", "yes"),
+                    })
+        matcher = cls(vocabulary)
+        logger.info(f"Loaded skill vocabulary: {len(matcher.skills)} skills, {matcher.pattern_count} patterns")
+        return matcher
+
+    def find_skills(self, text, limit=None):
+        """
+        Return the canonical skills mentioned in ``text``, most frequent
+        first (ties keep page order). Overlapping hits resolve to the
+        leftmost-longest one, so "Spring Boot" does not also count Spring.
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -m[1]))
+        counts = {}
+        covered = 0
+        for start, end, skill in matches:
+            if start < covered:
+                continue
+            covered = end
+            counts[skill] = counts.get(skill, 0) + 1
+        # dicts keep first-seen order, and sorted() is stable
+        skills = sorted(counts, key=counts.get, reverse=True)
+        return skills[:limit] if limit else skills
+
+    def canonicalize(self, skills):
+        """
+        Map free-form skill strings (e.g. from the LLM) onto canonical names.
+
+        A string that is one known skill becomes its canonical name, one
+        that mentions several is split into them, and one with no known
+        skill is kept as written so nothing the page asked for is lost.
+        """
+        result = []
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            found = self.find_skills(skill)
+            result.extend(found or [skill.strip()])
+        return list(dict.fromkeys(result))
+
+
+_lock = threading.Lock()
+_matcher = None
+_load_failed = False
+
+
+def get_skill_matcher():
+    """
+    Return the shared matcher, built on first use.
+
+    The vocabulary is data/skills.csv (or a skills.csv next to this module);
+    SKILL_VOCAB_PATH replaces it with one or more CSV files separated by
+    os.pathsep. Returns None when no vocabulary can be loaded.
+    """
+    global _matcher, _load_failed
+    with _lock:
+        if _matcher is None and not _load_failed:
+            configured = os.getenv("SKILL_VOCAB_PATH")
+            if configured:
+                paths = [path for path in configured.split(os.pathsep) if path]
+            else:
+                paths = [path for path in _DEFAULT_PATHS if os.path.exists(path)][:1]
+            try:
+                if not paths:
+                    raise FileNotFoundError("skills.csv")
+                _matcher = SkillMatcher.from_csv(*paths)
+            except (OSError, KeyError, csv.Error) as e:
+                _load_failed = True
+                logger.warning(f"Skill vocabulary not available: {e}. Local skill detection is disabled.")
+    return _matcher
+
+
+def find_skills(text, limit=None):
+    """Canonical skills mentioned in ``text``; empty when the vocabulary is unavailable"""
+    matcher = get_skill_matcher()
+    return matcher.find_skills(text, limit) if matcher else []
+
+
+def canonicalize_skills(skills):
+    """Canonical names for ``skills``; returned unchanged when the vocabulary is unavailable"""
+    matcher = get_skill_matcher()
+    return matcher.canonicalize(skills) if matcher else list(skills or [])
+
+
+def fill_job_skills(job, page_text="", limit=SKILL_PREFILL_LIMIT):
+    """
+    Canonicalize ``job['skills']``, or pre-fill them when the extractor found
+    none, from the job's own description and then the page text.
+
+    Updates ``job`` in place and returns the skills.
+    """
+    skills = job.get("skills") or []
+    if isinstance(skills, str):
+        skills = [skills]
+    skills = canonicalize_skills(skills)
+    if not skills:
+        job_text = " ".join(str(job.get(field) or "") for field in ("role", "description"))
+        skills = find_skills(job_text, limit) or find_skills(page_text, limit)
+        if skills:
+            logger.info(f"Detected {len(skills)} skills locally: {', '.join(skills)}")
+    job["skills"] = skills
+    return skills
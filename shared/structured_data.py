@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import html
+import logging
+
+from llm_json import parse_json_lenient
+from skill_matcher import find_skills, SKILL_PREFILL_LIMIT
+
+logger = logging.getLogger(__name__)
+
+_JSON_LD_RE = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONTROL_RE = re.compile(r"[\x00-\x1f]")
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:[,;|\n•]|\s-\s)\s*")
+_EXPERIENCE_RE = re.compile(
+    r"\b(\d+(?:\.\d+)?\s*\+?\s*(?:(?:-|to|–)\s*\d+\s*\+?\s*)?(?:years?|yrs?)\b(?:\s+of)?(?:\s+\w+)?\s+experience)",
+    re.IGNORECASE,
+)
+
+# Longer descriptions are cut at a word boundary; the email prompt only needs the gist
+MAX_DESCRIPTION_CHARS = int(os.getenv("STRUCTURED_DESCRIPTION_CHARS", "2000"))
+
+# A posting with these fields skips the extraction LLM call
+REQUIRED_FIELDS = ("role", "skills", "description")
+
+
+def _is_job_posting(node):
+    types = node.get("@type")
+    if not isinstance(types, list):
+        types = [types]
+    return any(isinstance(t, str) and t.rsplit("/", 1)[-1].rsplit(":", 1)[-1] == "JobPosting" for t in types)
+
+
+def _find_postings(node, depth=0):
+    """Yield every JobPosting object in a JSON-LD document, including @graph and nested lists"""
+    if depth > 8:
+        return
+    if isinstance(node, list):
+        for item in node:
+            yield from _find_postings(item, depth + 1)
+    elif isinstance(node, dict):
+        if _is_job_posting(node):
+            yield node
+            return
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from _find_postings(value, depth + 1)
+
+
+def _text(value):
+    """Flatten a JSON-LD value (string, list or typed object) into plain text"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(filter(None, (_text(item) for item in value)))
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("description") or value.get("@value"))
+    text = html.unescape(str(value))
+    if "<" in text:
+        from bs4 import BeautifulSoup
+        text = BeautifulSoup(text, "html.parser").get_text(" ")
+    return " ".join(text.split())
+
+
+def _skills(value):
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else [value]
+    skills = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("@value") or ""
+        skills.extend(_SKILL_SPLIT_RE.split(html.unescape(str(item))))
+    return list(dict.fromkeys(skill.strip(" .") for skill in skills if skill.strip(" .")))
+
+
+def _experience(value, description):
+    if isinstance(value, dict):
+        months = value.get("monthsOfExperience")
+        try:
+            months = float(months)
+        except (TypeError, ValueError):
+            months = None
+        if months:
+            return f"{months / 12:g}+ years" if months >= 12 else f"{months:g}+ months"
+        value = value.get("description") or value.get("name")
+    text = _text(value)
+    if text:
+        return text
+    match = _EXPERIENCE_RE.search(description)
+    return match.group(1) if match else ""
+
+
+def _truncate(text, limit=MAX_DESCRIPTION_CHARS):
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def _to_job(fields):
+    """Map schema.org JobPosting properties onto the role/experience/skills/description shape"""
+    description = _text(fields.get("description"))
+    # Many postings leave out the skills property; the description names them anyway
+    skills = _skills(fields.get("skills")) or find_skills(description, SKILL_PREFILL_LIMIT)
+    return {
+        "role": _text(fields.get("title") or fields.get("name")),
+        "experience": _experience(fields.get("experienceRequirements"), description),
+        "skills": skills,
+        "description": _truncate(description),
+    }
+
+
+def _json_ld_postings(raw_html):
+    for match in _JSON_LD_RE.finditer(raw_html):
+        block = match.group(1).strip()
+        if "JobPosting" not in block:
+            continue
+        # CMSs often emit raw newlines and tabs inside strings; as spaces they are valid anywhere
+        block = _CONTROL_RE.sub(" ", block)
+        try:
+            data = json.loads(block)
+        except ValueError:
+            try:
+                data, _ = parse_json_lenient(block)
+            except ValueError:
+                logger.warning("Skipping unparseable JSON-LD block")
+                continue
+        yield from _find_postings(data)
+
+
+def _owned_by(tag, scope):
+    """False for properties of nested items, e.g. hiringOrganization's name"""
+    for parent in tag.parents:
+        if parent is scope:
+            return True
+        if parent.has_attr("itemscope"):
+            return False
+    return True
+
+
+def _microdata_postings(raw_html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(raw_html, "html.parser")
+    for scope in soup.select('[itemtype*="JobPosting"]'):
+        fields = {}
+        for tag in scope.find_all(attrs={"itemprop": True}):
+            if not _owned_by(tag, scope):
+                continue
+            if tag.name == "meta":
+                value = tag.get("content", "")
+            elif tag.name in ("a", "link"):
+                value = tag.get("href", "")
+            elif tag.name == "time":
+                value = tag.get("datetime") or tag.get_text(" ")
+            else:
+                value = tag.get_text(" ")
+            for name in tag["itemprop"].split():
+                if name in fields:
+                    fields[name] = fields[name] + [value] if isinstance(fields[name], list) else [fields[name], value]
+                else:
+                    fields[name] = value
+        yield fields
+
+
+def extract_structured_jobs(raw_html):
+    """
+    Read schema.org JobPosting data (JSON-LD, then microdata) from raw HTML.
+
+    Returns ``(jobs, stats)``. ``jobs`` holds the postings mapped to the
+    same shape ``Chain.extract_jobs`` returns, and is non-empty only when
+    at least one posting has a title, skills and a description, so callers
+    can skip the extraction LLM call. ``stats`` reports the source, how
+    many postings were found and which required fields were missing.
+    Disabled by STRUCTURED_DATA_DISABLED.
+    """
+    stats = {"source": None, "postings": 0, "complete": False, "missing": []}
+    if not raw_html or os.getenv("STRUCTURED_DATA_DISABLED", "").lower() in ("1", "true", "yes"):
+        return [], stats
+
+    try:
+        sources = [("json-ld", _json_ld_postings)]
+        if re.search(r"itemtype\s*=\s*[\"'][^\"']*JobPosting", raw_html, re.IGNORECASE):
+            sources.append(("microdata", _microdata_postings))
+
+        for source, reader in sources:
+            jobs = [_to_job(fields) for fields in reader(raw_html)]
+            if not jobs:
+                continue
+            complete = [job for job in jobs if all(job[field] for field in REQUIRED_FIELDS)]
+            stats.update(source=source, postings=len(jobs), complete=bool(complete))
+            if complete:
+                logger.info(f"Found {len(complete)} complete JobPosting(s) in {source}; skipping LLM extraction")
+                return complete, stats
+            stats["missing"] = sorted({field for job in jobs for field in REQUIRED_FIELDS if not job[field]})
+    except Exception as e:
+        logger.warning(f"Structured data extraction failed: {e}")
+
+    return [], stats
@@ -1,20 +1,137 @@
 import re
 import logging
 
+# HTML tags; a '<' with no later '>' is plain text. [^>]* cannot run past the
+# first '>', so the greedy form matches exactly what '<[^>]*?>' did, only faster.
+_TAG_RE = re.compile(r'<[^>]*>')
+# URLs. The original alternation (letters, digits, [$-_@.&+], [!*\\(\\),], %XX)
+# accepts exactly the characters in this class, one at a time.
+_URL_RE = re.compile(r'http[s]?://[a-zA-Z0-9!$-_]+')
+# Every ASCII byte outside [a-zA-Z0-9 ]; non-ASCII is dropped while encoding
+_SPECIAL_BYTES = bytes(b for b in range(128) if not (chr(b).isalnum() or b == 0x20))
+# Whole strings are cleaned in slices of this size to bound peak memory
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _strip_tags(chunks):
+    """
+    Yield the text of ``chunks`` with HTML tags removed.
+
+    A tag may span chunk boundaries: text from an unclosed '<' is held back
+    until its '>' arrives, and emitted verbatim if the stream ends first.
+    """
+    pending = []
+    for chunk in chunks:
+        if pending:
+            close = chunk.find('>')
+            if close == -1:
+                pending.append(chunk)
+                continue
+            pending = []
+            chunk = chunk[close + 1:]
+
+        open_at = chunk.find('<', chunk.rfind('>') + 1)
+        if open_at == -1:
+            yield _TAG_RE.sub('', chunk)
+        else:
+            yield _TAG_RE.sub('', chunk[:open_at])
+            pending.append(chunk[open_at:])
+
+    if pending:
+        yield ''.join(pending)
+
+
+def iter_clean_text(chunks):
+    """
+    Clean text incrementally from a string or an iterator of string chunks.
+
+    Yields pieces whose concatenation equals ``clean_text(''.join(chunks))``,
+    so cleaning can overlap with download. Each chunk goes through one
+    pipeline (tags, URLs, special characters, whitespace) instead of five
+    copies of the whole page. A URL never contains whitespace, so only the
+    text after the last whitespace character of a chunk is held back.
+    """
+    if isinstance(chunks, str):
+        text = chunks
+        chunks = (text[i:i + _CHUNK_SIZE] for i in range(0, len(text), _CHUNK_SIZE))
+
+    tail = []
+    started = False
+    pending_space = False
+
+    def emit(segment):
+        nonlocal started, pending_space
+        segment = _URL_RE.sub('', segment).encode('ascii', 'ignore').translate(None, _SPECIAL_BYTES)
+        words = segment.split()
+        if not words:
+            pending_space = pending_space or bool(segment)
+            return ''
+        out = b' '.join(words).decode('ascii')
+        if started and (pending_space or segment[:1] == b' '):
+            out = ' ' + out
+        started = True
+        pending_space = segment[-1:] == b' '
+        return out
+
+    for piece in _strip_tags(chunks):
+        cut = max(piece.rfind(' '), piece.rfind('\n'), piece.rfind('\t'), piece.rfind('\r'))
+        if cut == -1:
+            tail.append(piece)
+            continue
+        tail.append(piece[:cut + 1])
+        out = emit(''.join(tail))
+        tail = [piece[cut + 1:]]
+        if out:
+            yield out
+
+    out = emit(''.join(tail))
+    if out:
+        yield out
+
+
 def clean_text(text):
-    # Remove HTML tags
-    text = re.sub(r'<[^>]*?>', '', text)
-    # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-    # Remove special characters
-    text = re.sub(r'[^a-zA-Z0-9 ]', '', text)
-    # Replace multiple spaces with a single space
-    text = re.sub(r'\s{2,}', ' ', text)
-    # Trim leading and trailing whitespace
-    text = text.strip()
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    return text
+    """
+    Strip HTML tags, URLs and special characters and collapse whitespace.
+
+    Accepts a string or an iterator of string chunks.
+    """
+    return ''.join(iter_clean_text(text))
+
+def estimate_tokens(text):
+    """Rough token count for Llama-style tokenizers (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
+def split_text(text, max_tokens, overlap_tokens=0):
+    """
+    Split cleaned text into chunks of at most ``max_tokens`` estimated tokens.
+
+    Chunks break on word boundaries and each one repeats the last
+    ``overlap_tokens`` of the previous chunk, so a posting cut at a boundary
+    is still seen whole by at least one chunk.
+    """
+    max_chars = max(1, max_tokens * 4)
+    overlap_chars = max(0, min(overlap_tokens * 4, max_chars // 2))
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        if end < len(text):
+            # Back up to the last space so no word is split
+            space = text.rfind(' ', start + 1, end)
+            if space > start:
+                end = space
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        next_start = end - overlap_chars
+        if overlap_chars:
+            space = text.find(' ', next_start, end)
+            next_start = space + 1 if space != -1 else next_start
+        start = max(next_start, start + 1)
+    return [chunk for chunk in chunks if chunk]
 
 if __name__ == "__main__":
     import os
@@ -1,4 +1,5 @@
 import streamlit as st
+import asyncio
 import sys
 import os
 
@@ -6,11 +7,12 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data'))
 
-from langchain_community.document_loaders import WebBaseLoader
-
 from chains import Chain
 from portfolio import Portfolio
-from utils import clean_text
+from page_cache import load_page
+from content_extractor import extract_job_text
+from structured_data import extract_structured_jobs
+from skill_matcher import fill_job_skills
 
 # Initialize components only once using session state
 @st.cache_resource
@@ -23,11 +25,6 @@ def get_portfolio():
     """Initialize Portfolio only once and cache it"""
     return Portfolio()
 
-@st.cache_resource
-def get_clean_text_func():
-    """Get clean_text function"""
-    return clean_text
-
 def create_streamlit_app():
     st.title("📧 Cold Mail Generator")
     
@@ -36,7 +33,6 @@ def create_streamlit_app():
         try:
             chain = get_chain()
             portfolio = get_portfolio()
-            clean_text_func = get_clean_text_func()
             st.success("✅ Components initialized!")
         except Exception as e:
             st.error(f"❌ Initialization failed: {e}")
@@ -55,22 +51,46 @@ def create_streamlit_app():
                 
                 # Scrape and clean data
                 st.info("🌐 Scraping job posting...")
-                loader = WebBaseLoader([url_input])
-                data = clean_text_func(loader.load().pop().page_content)
+                raw_html, data = load_page(url_input)
+                jobs, structured_stats = extract_structured_jobs(raw_html)
+                if jobs:
+                    st.caption(f"⚡ Read the job details from the page's {structured_stats['source']} data")
+                else:
+                    data, extraction_stats = extract_job_text(raw_html, data)
+                    if extraction_stats["tokens_saved"] > 0:
+                        st.caption(f"✂️ Trimmed page to the job description: ~{extraction_stats['tokens_saved']} tokens saved")
+                    
+                    # Extract jobs
+                    st.info("🤖 Extracting job details with AI...")
+                    jobs = chain.extract_jobs(data)
                 
-                # Extract jobs
-                st.info("🤖 Extracting job details with AI...")
-                jobs = chain.extract_jobs(data)
+                # Canonical skill names, or skills found in the page when the extractor returned none
+                for job in jobs:
+                    fill_job_skills(job, data)
                 
-                # Generate emails
                 st.info("✉️ Generating personalized emails...")
-                for job in jobs:
-                    skills = job.get('skills', [])
-                    links = portfolio.query_links(skills)
-                    email = chain.write_mail(job, links)
-                    
+                if len(jobs) == 1:
+                    # Single posting: stream tokens so the email appears immediately,
+                    # in the same copyable code block the multi-job path uses
+                    job = jobs[0]
+                    links = portfolio.query_links(job.get('skills', []))
+                    placeholder = st.empty()
+                    email = ""
+                    for token in chain.write_mail_stream(job, links):
+                        email += token
+                        placeholder.code(email, language='markdown')
+                    placeholder.code(email, language='markdown')
                     st.success("✅ Email generated successfully!")
-                    st.code(email, language='markdown')
+                else:
+                    # Several postings: generate all emails concurrently
+                    results = asyncio.run(chain.awrite_mails(jobs, portfolio))
+                    for result in results:
+                        if result.get("error"):
+                            st.error(f"❌ Failed to generate email for {result['job'].get('role', 'job')}: {result['error']}")
+                            continue
+                        
+                        st.success("✅ Email generated successfully!")
+                        st.code(result["email"], language='markdown')
                     
         except Exception as e:
             st.error(f"❌ An Error Occurred: {str(e)}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the text handling that runs without an LLM: lenient JSON
+parsing of extraction output and the streaming clean_text pipeline
+"""
+import os
+import re
+import sys
+import json
+import random
+
+# Add shared directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'shared'))
+
+from llm_json import parse_json_lenient, _close_partial
+from utils import clean_text, iter_clean_text
+
+JOBS_JSON = json.dumps([
+    {
+        "role": "Senior Python Developer",
+        "experience": "5+ years",
+        "skills": ["Python", "Django", "AWS", "C++"],
+        "description": "Build APIs, \"quoted\" text and a back\\slash; 50% remote, [hybrid] {flexible}",
+    },
+    {
+        "role": "Frontend Engineer",
+        "experience": None,
+        "skills": [],
+        "description": "React, TypeScript, remote: true",
+        "salary": 120000.5,
+        "remote": True,
+    },
+], indent=2)
+
+PAGES = [
+    "<html><body><h1>Senior   Python Developer</h1><p>Apply at https://jobs.example.com/apply?id=42&ref=x now!</p></body></html>",
+    "  Leading\tand trailing\n\nwhitespace   <b>bold</b>  ",
+    "Pay: $120,000 - $150,000 (USD) & benefits; Café résumé naïve — 100% remote",
+    "a < b and c > d, unclosed <tag and http://x.io/path(1),more text",
+    "<script>var x = '<p>';</script>text<br/>after<!-- comment -->end",
+    "",
+    "   ",
+    "no-tags-here_at_all https://a.b/c%20d?e=f#g tail",
+]
+
+
+def original_clean_text(text):
+    """clean_text as it was before it became a streaming pipeline"""
+    text = re.sub(r'<[^>]*?>', '', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'[^a-zA-Z0-9 ]', '', text)
+    text = re.sub(r'\s{2,}', ' ', text)
+    text = text.strip()
+    return ' '.join(text.split())
+
+
+def _parses(text):
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+def test_truncated_json():
+    """Every prefix of the extraction output parses to jobs, and the full text parses unrepaired"""
+    try:
+        value, repaired = parse_json_lenient(JOBS_JSON)
+        if repaired or value != json.loads(JOBS_JSON):
+            print("❌ Complete JSON was not returned unchanged")
+            return False
+
+        for wrapper in ("{}", "```json\n{}", "Here are the jobs:\n```json\n{}"):
+            for end in range(1, len(JOBS_JSON) + 1):
+                text = wrapper.format(JOBS_JSON[:end])
+                if not any(_parses(candidate) for candidate in _close_partial(JOBS_JSON[:end])):
+                    print(f"❌ No repair candidate parses when cut after {end} characters")
+                    return False
+                try:
+                    value, _ = parse_json_lenient(text)
+                except ValueError as e:
+                    print(f"❌ Output cut after {end} characters did not parse: {e}")
+                    return False
+                if not isinstance(value, list) or not all(isinstance(job, dict) for job in value):
+                    print(f"❌ Output cut after {end} characters parsed to {value!r}")
+                    return False
+        print(f"✅ All {len(JOBS_JSON)} truncation points parse, with and without fences")
+        return True
+    except Exception as e:
+        print(f"❌ JSON repair error: {e}")
+        return False
+
+
+def test_clean_text_matches_original():
+    """clean_text gives byte-identical output to the original regex chain"""
+    try:
+        rng = random.Random(0)
+        alphabet = "ab Z9<>/\"'=&%:.-_?#\t\n\r é—" + "http://"
+        pages = PAGES + ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200))) for _ in range(500)]
+        for page in pages:
+            if clean_text(page) != original_clean_text(page):
+                print(f"❌ clean_text differs from the original for {page[:60]!r}")
+                return False
+        print(f"✅ clean_text matches the original on {len(pages)} pages")
+        return True
+    except Exception as e:
+        print(f"❌ clean_text error: {e}")
+        return False
+
+
+def test_iter_clean_text_chunking():
+    """iter_clean_text joins to clean_text however the input is split"""
+    try:
+        checked = 0
+        for page in PAGES:
+            expected = clean_text(page)
+            for size in range(1, len(page) + 1):
+                chunks = [page[i:i + size] for i in range(0, len(page), size)]
+                if ''.join(iter_clean_text(iter(chunks))) != expected:
+                    print(f"❌ Chunks of {size} characters differ for {page[:60]!r}")
+                    return False
+                checked += 1
+            for cut in range(len(page) + 1):
+                if ''.join(iter_clean_text(iter([page[:cut], page[cut:]]))) != expected:
+                    print(f"❌ Splitting at {cut} differs for {page[:60]!r}")
+                    return False
+                checked += 1
+        print(f"✅ iter_clean_text matches clean_text for {checked} chunkings")
+        return True
+    except Exception as e:
+        print(f"❌ iter_clean_text error: {e}")
+        return False
+
+
+def main():
+    print("🧪 Testing text processing...")
+    print("=" * 50)
+
+    failed = False
+
+    print("\n🧩 Testing lenient JSON parsing...")
+    if not test_truncated_json():
+        failed = True
+
+    print("\n🧹 Testing clean_text...")
+    if not test_clean_text_matches_original():
+        failed = True
+
+    print("\n🌊 Testing streaming clean_text...")
+    if not test_iter_clean_text_chunking():
+        failed = True
+
+    print("\n" + "=" * 50)
+    if failed:
+        print("❌ Some text processing tests failed")
+        sys.exit(1)
+    print("🎉 All text processing tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import os
+import glob
+import string
+import logging
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Slots an email template may use, and those of the per-project line
+EMAIL_SLOTS = ("role", "company", "level", "skills", "focus", "url", "projects", "sender")
+PROJECT_SLOTS = ("title", "link", "techstack")
+
+SENDER_NAME = os.getenv("SENDER_NAME", "[Your Name]")
+
+# Portfolio projects listed in each email
+TEMPLATE_PROJECTS = int(os.getenv("TEMPLATE_PROJECTS", "2"))
+
+# Distinct skill lists whose portfolio matches are kept in memory
+PROJECT_CACHE_SIZE = 1024
+
+# Used when the templates directory cannot be loaded, so the no-LLM path still answers
+_FALLBACK_TEMPLATES = {
+    "default": (
+        "Subject: Application for {role} Position\n\n"
+        "Dear Hiring Manager,\n\n"
+        "I am writing to express my interest in the {role} position at {company}, "
+        "which I found at {url}. My experience includes {focus}.\n\n"
+        "Relevant work:\n{projects}\n\n"
+        "I would welcome the opportunity to discuss how I can contribute to your team.\n\n"
+        "Best regards,\n{sender}"
+    ),
+    "project": "• {title} ({techstack}): {link}",
+}
+
+
+class EmailTemplate:
+    """
+    One template, checked and parsed once.
+
+    Slots are ``{name}`` fields; ``{{`` and ``}}`` are literal braces. An
+    unknown slot, a positional ``{}`` or a format spec raises ValueError when
+    the template is loaded, never while rendering.
+    """
+
+    def __init__(self, name, text, slots=EMAIL_SLOTS):
+        self.name = name
+        self.slots = set()
+        for _, field, spec, conversion in string.Formatter().parse(text):
+            if field is None:
+                continue
+            if field not in slots or spec or conversion:
+                raise ValueError(f"Template '{name}' has an unsupported slot {{{field}}}; allowed: {', '.join(slots)}")
+            self.slots.add(field)
+        # str.format_map runs in C; binding it here keeps rendering to one call
+        self.render = text.format_map
+
+
+class EmailTemplates:
+    """
+    Per-role email templates rendered from a job dict and portfolio matches.
+
+    ``templates`` maps a role rule id from url_rules.csv (e.g.
+    ``frontend-developer``) to its template text; ``default`` is used for
+    every other role and ``project`` is the line repeated for each matched
+    portfolio project. ``portfolio`` is a Portfolio, or None to list no
+    projects. The portfolio does not change while the process runs, so the
+    matched projects and their rendered lines are cached per skill list.
+    """
+
+    def __init__(self, templates, portfolio=None):
+        missing = {"default", "project"} - set(templates)
+        if missing:
+            raise ValueError(f"Missing required templates: {', '.join(sorted(missing))}")
+        self.project = EmailTemplate("project", templates["project"].strip("\n"), PROJECT_SLOTS)
+        self.templates = {
+            name: EmailTemplate(name, text.strip("\n"))
+            for name, text in templates.items() if name != "project"
+        }
+        self.portfolio = portfolio
+        self._projects_for = lru_cache(maxsize=PROJECT_CACHE_SIZE)(self._projects_block)
+
+    @classmethod
+    def from_dir(cls, path=TEMPLATES_DIR, portfolio=None):
+        """Load every ``<name>.txt`` in ``path``; the file name is the template name"""
+        templates = {}
+        for file_path in sorted(glob.glob(os.path.join(path, "*.txt"))):
+            with open(file_path, encoding='utf-8') as f:
+                templates[os.path.splitext(os.path.basename(file_path))[0]] = f.read()
+        loaded = cls(templates, portfolio)
+        logger.info(f"Loaded {len(loaded.templates)} email templates from {path}")
+        return loaded
+
+    def template_for(self, role_id):
+        """The template for a role rule id, or the default one"""
+        return self.templates.get(role_id) or self.templates["default"]
+
+    def match_projects(self, skills, n_results=TEMPLATE_PROJECTS):
+        """
+        Portfolio projects for ``skills`` as ``{title, link, techstack}``,
+        from the Title, Links and Techstack columns; a portfolio without
+        titles uses the link. When no project shares a skill the first rows
+        of the portfolio are listed instead, so the email always shows real
+        work.
+        """
+        if self.portfolio is None:
+            return []
+        rows = self.portfolio.match_projects(skills, n_results) or self.portfolio.data[:n_results]
+        return [{
+            "title": row.get("Title") or row["Links"],
+            "link": row["Links"],
+            "techstack": row["Techstack"],
+        } for row in rows]
+
+    def _projects_block(self, skills):
+        projects = tuple(self.match_projects(skills))
+        return projects, "\n".join(self.project.render(project) for project in projects)
+
+    def render(self, job, url=""):
+        """
+        Render the email for ``job``: a dict with ``role``, ``company``,
+        ``level``, ``skills`` and optionally ``focus`` and ``rules`` (the
+        url_rules ids that fired, which pick the template).
+
+        Returns ``{"email", "matched_projects", "template"}``.
+        """
+        skills = list(job.get("skills") or [])
+        projects, projects_text = self._projects_for(tuple(skills))
+        template = self.template_for((job.get("rules") or {}).get("role"))
+        skills_text = ", ".join(skills[:4])
+        email = template.render({
+            "role": job.get("role") or "Software Engineer",
+            "company": job.get("company") or "your company",
+            "level": job.get("level") or "",
+            "skills": skills_text,
+            "focus": job.get("focus") or skills_text,
+            "url": url,
+            "projects": projects_text,
+            "sender": SENDER_NAME,
+        })
+        return {"email": email, "matched_projects": [dict(project) for project in projects], "template": template.name}
+
+
+_lock = threading.Lock()
+_templates = None
+
+
+def _template_portfolio():
+    """The portfolio for template emails: CSV and in-memory index only, no vector store"""
+    try:
+        from portfolio import Portfolio
+        return Portfolio(vector_search=False)
+    except Exception as e:
+        logger.warning(f"Portfolio not available for template emails: {e}")
+        return None
+
+
+def get_email_templates():
+    """
+    Return the shared templates, loaded from EMAIL_TEMPLATES_DIR (default
+    templates/) on first use together with the portfolio. If the directory
+    cannot be loaded a built-in default template is used.
+    """
+    global _templates
+    with _lock:
+        if _templates is None:
+            portfolio = _template_portfolio()
+            try:
+                _templates = EmailTemplates.from_dir(os.getenv("EMAIL_TEMPLATES_DIR", TEMPLATES_DIR), portfolio)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Email templates not available: {e}. Using the built-in template.")
+                _templates = EmailTemplates(_FALLBACK_TEMPLATES, portfolio)
+    return _templates
+
+
+def render_email(job, url=""):
+    """Render the template email for ``job``; see EmailTemplates.render"""
+    return get_email_templates().render(job, url)
@@ -28,63 +28,49 @@ def load_env_vars():
     except ImportError:
         pass
 
-def analyze_job_url(job_url):
-    """Analyze job URL to extract context and requirements"""
-    url_lower = job_url.lower()
+def _url_skills(job_url):
+    """Skills from the skill vocabulary mentioned in the URL, e.g. .../senior-golang-kafka-engineer"""
+    try:
+        from urllib.parse import urlparse, unquote_plus
+        from skill_matcher import find_skills
+        parsed = urlparse(job_url)
+        return find_skills(unquote_plus(f"{parsed.path} {parsed.query}"))
+    except Exception as e:
+        print(f"Skill detection skipped: {e}", file=sys.stderr)
+        return []
+
+def _url_context(job_url):
+    """
+    Job context from the URL rule table (url_rules.csv), plus the role rule
+    it came from and the skills named in the URL
+    """
+    from url_rules import get_url_rules
     
-    # Determine role based on URL
-    if "senior" in url_lower and "python" in url_lower:
-        role = "Senior Python Developer"
-        skills = ["Python", "Django", "FastAPI", "PostgreSQL", "Redis", "AWS"]
-        level = "Senior"
-    elif "python" in url_lower:
-        role = "Python Developer"
-        skills = ["Python", "Django", "FastAPI", "REST APIs", "databases"]
-        level = "Mid-level"
-    elif "react" in url_lower or "frontend" in url_lower:
-        role = "Frontend Developer" 
-        skills = ["React", "JavaScript", "TypeScript", "CSS", "Node.js"]
-        level = "Mid-level"
-    elif "fullstack" in url_lower or "full-stack" in url_lower:
-        role = "Full-Stack Developer"
-        skills = ["React", "Python", "JavaScript", "PostgreSQL", "Docker"]
-        level = "Mid-level"
-    elif "data" in url_lower and "scientist" in url_lower:
-        role = "Data Scientist"
-        skills = ["Python", "Machine Learning", "Pandas", "NumPy", "TensorFlow"]
-        level = "Mid-level"
-    elif "embedded" in url_lower or ("c++" in url_lower):
-        role = "Embedded Engineer"
-        skills = ["C++", "C", "Embedded Systems", "RTOS", "Hardware"]
-        level = "Mid-level"
-    elif "devops" in url_lower:
-        role = "DevOps Engineer"
-        skills = ["Docker", "Kubernetes", "AWS", "CI/CD", "Python"]
-        level = "Mid-level"
-    else:
-        role = "Software Engineer"
-        skills = ["Python", "JavaScript", "React", "databases", "APIs"]
-        level = "Mid-level"
+    match = get_url_rules().match(job_url)
+    role = match["role"]
+    print(f"📐 URL rules fired: {match['fired']}", file=sys.stderr)
     
-    # Extract company hint
-    company_hint = "your company"
-    if "google" in url_lower:
-        company_hint = "Google"
-    elif "microsoft" in url_lower:
-        company_hint = "Microsoft"
-    elif "meta" in url_lower:
-        company_hint = "Meta"
-    elif "amazon" in url_lower:
-        company_hint = "Amazon"
+    # Technologies named in the URL slug come first; the role defaults fill the rest
+    skills = list(role["skills"])
+    detected = _url_skills(job_url)
+    if detected:
+        skills = list(dict.fromkeys(detected + skills))[:max(len(skills), len(detected))]
     
-    return {
+    context = {
         "url": job_url,
-        "role": role,
+        "role": role["value"],
         "skills": skills,
-        "level": level,
-        "company": company_hint,
-        "extracted_from": "url_analysis"
+        "level": match["level"]["value"] if match["level"] else role["level"],
+        "company": match["company"]["value"] if match["company"] else "your company",
+        "extracted_from": "url_analysis",
+        "rules": match["fired"]
     }
+    return context, role, detected
+
+def analyze_job_url(job_url):
+    """Analyze job URL to extract context and requirements"""
+    context, _, _ = _url_context(job_url)
+    return context
 
 def create_dynamic_prompt(job_url, job_context):
     """Create dynamic, job-specific prompt for LLaMA"""
@@ -128,15 +114,15 @@ def generate_ai_email(job_url):
     """Generate email using AI with timeout and fallback"""
     try:
         load_env_vars()
-        from groq import Groq
+        from groq_client import get_groq_client
         
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key or api_key == "your_groq_api_key_here":
             raise Exception("No valid API key")
             
-        # Initialize Groq client with minimal parameters to avoid conflicts
+        # Shared client: reuses pooled keep-alive connections across calls
         print(f"🔑 Using API key: {api_key[:8]}..." + "*" * (len(api_key) - 8), file=sys.stderr)
-        client = Groq(api_key=api_key)  # Remove timeout parameter
+        client = get_groq_client(api_key)
         
         # Analyze job URL for better context
         job_context = analyze_job_url(job_url)
@@ -191,65 +177,33 @@ def generate_ai_email(job_url):
         return generate_smart_template(job_url, str(e))
 
 def generate_smart_template(job_url, error_reason=None):
-    """Generate smart template email based on URL analysis"""
+    """Generate a template email from URL analysis and the portfolio (templates/)"""
+    from email_templates import render_email
     
     # Extract some context from URL
-    url_lower = job_url.lower()
-    company_hint = "the company"
-    role_hint = "Software Developer"
-    
-    if "python" in url_lower:
-        role_hint = "Python Developer"
-        skills_focus = "Python development, FastAPI, Django, and data analysis"
-    elif "javascript" in url_lower or "js" in url_lower or "react" in url_lower:
-        role_hint = "Frontend Developer" 
-        skills_focus = "JavaScript, React, and modern frontend development"
-    elif "fullstack" in url_lower or "full-stack" in url_lower:
-        role_hint = "Full-Stack Developer"
-        skills_focus = "full-stack development with Python and React"
+    job_context, role_rule, detected = _url_context(job_url)
+    if not job_context["rules"]["company"]:
+        job_context["company"] = "the company"
+    if detected or not role_rule["focus"]:
+        job_context["focus"] = ", ".join(job_context["skills"][:4])
     else:
-        skills_focus = "Python, JavaScript, React, and full-stack development"
+        job_context["focus"] = role_rule["focus"]
+    
+    rendered = render_email(job_context, job_url)
     
-    email_content = f"""Subject: Application for {role_hint} Position
-
-Dear Hiring Manager,
-
-I am writing to express my strong interest in the {role_hint} position at {company_hint}. I discovered this opportunity through {job_url} and am excited about the possibility of contributing to your team.
-
-My technical expertise includes {skills_focus}. I have successfully delivered several projects that demonstrate these skills:
-
-• E-commerce Platform: A full-stack application built with React and Python, featuring user authentication, payment processing, and responsive design
-• Data Analytics Dashboard: Interactive visualization tool using Python, Pandas, and Streamlit for real-time business insights
-
-I am particularly drawn to this role because it aligns perfectly with my passion for building scalable, user-focused applications. I would welcome the opportunity to discuss how my skills and enthusiasm can contribute to your team's success.
-
-Thank you for your consideration. I look forward to hearing from you.
-
-Best regards,
-[Your Name]"""
-
     result = {
         "success": True,
         "job": {
             "url": job_url,
-            "role": role_hint,
-            "inferred_skills": skills_focus.split(", ")
+            "role": job_context["role"],
+            "inferred_skills": job_context["skills"][:4],
+            "rules": job_context["rules"]
         },
-        "matched_projects": [
-            {
-                "title": "E-commerce Platform", 
-                "description": "Full-stack application with React and Python",
-                "link": "https://github.com/user/ecommerce"
-            },
-            {
-                "title": "Data Analytics Dashboard",
-                "description": "Interactive visualization with Python and Streamlit", 
-                "link": "https://github.com/user/analytics"
-            }
-        ],
-        "email": email_content,
+        "matched_projects": rendered["matched_projects"],
+        "email": rendered["email"],
         "url": job_url,
-        "method": "smart_template"
+        "method": "smart_template",
+        "template": rendered["template"]
     }
     
     if error_reason:
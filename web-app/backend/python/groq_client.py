@@ -0,0 +1,67 @@
+import os
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_http_client = None
+_groq_clients = {}
+
+
+def _pool_limits():
+    size = int(os.getenv("GROQ_POOL_SIZE", "20"))
+    return httpx.Limits(
+        max_connections=size,
+        max_keepalive_connections=size,
+        keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def _timeouts():
+    return httpx.Timeout(
+        float(os.getenv("GROQ_TIMEOUT", "60")),
+        connect=float(os.getenv("GROQ_CONNECT_TIMEOUT", "10")),
+    )
+
+
+def get_http_client():
+    """
+    Return the process-wide keep-alive httpx client used for Groq requests.
+
+    Every Groq and ChatGroq client built through this module shares its
+    connection pool, so TLS and connection setup happen once per pooled
+    connection rather than once per call. Pool size and timeouts come from
+    GROQ_POOL_SIZE, GROQ_KEEPALIVE_EXPIRY, GROQ_TIMEOUT and GROQ_CONNECT_TIMEOUT.
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=_pool_limits(), timeout=_timeouts(), follow_redirects=True)
+            logger.info("Created pooled HTTP client for Groq")
+    return _http_client
+
+
+def get_groq_client(api_key=None):
+    """Return a shared ``groq.Groq`` client for ``api_key`` (default GROQ_API_KEY)"""
+    from groq import Groq
+
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    http_client = get_http_client()
+    with _lock:
+        client = _groq_clients.get(api_key)
+        if client is None:
+            client = _groq_clients[api_key] = Groq(api_key=api_key, http_client=http_client)
+    return client
+
+
+def close_clients():
+    """Close the pooled connections, e.g. when a worker shuts down"""
+    global _http_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _groq_clients.clear()
@@ -7,45 +7,71 @@ import json
 import os
 
 def generate_email_simple(job_url):
-    """Generate a simple email without AI dependencies"""
+    """Generate a template email without AI dependencies"""
+    from url_rules import get_url_rules
+    from email_templates import render_email
+    
+    match = get_url_rules().match(job_url)
+    role = match["role"]
+    job = {
+        "role": role["value"],
+        "company": match["company"]["value"] if match["company"] else "your company",
+        "level": match["level"]["value"] if match["level"] else role["level"],
+        "skills": role["skills"],
+        "focus": role["focus"],
+        "rules": match["fired"]
+    }
+    rendered = render_email(job, job_url)
+    
     return {
         "success": True,
         "job": {
-            "role": "Software Developer",
-            "company": "Tech Company",
-            "skills": ["Python", "JavaScript", "React"]
+            "role": job["role"],
+            "company": job["company"],
+            "skills": job["skills"]
         },
-        "matched_projects": [
-            {
-                "title": "Portfolio Website",
-                "description": "A React-based portfolio showcasing web development skills",
-                "link": "https://github.com/user/portfolio"
-            }
-        ],
-        "email": f"""Subject: Application for Software Developer Position
-
-Dear Hiring Manager,
-
-I am writing to express my interest in the Software Developer position at your company. I found the job posting at {job_url} and believe my skills align well with your requirements.
-
-My experience includes:
-- Python development for backend services
-- JavaScript and React for frontend applications
-- Full-stack web development
-
-I have attached my portfolio project which demonstrates these skills:
-- Portfolio Website: A React-based portfolio showcasing web development skills
-  GitHub: https://github.com/user/portfolio
-
-I would welcome the opportunity to discuss how my skills could contribute to your team.
-
-Best regards,
-[Your Name]
-        """.strip(),
+        "matched_projects": rendered["matched_projects"],
+        "email": rendered["email"],
         "url": job_url,
-        "method": "simple_template"
+        "method": "simple_template",
+        "template": rendered["template"]
     }
 
+def serve():
+    """
+    Long-lived template worker: python no_deps_generator.py serve
+
+    Reads newline-delimited JSON requests such as ``{"id": "1", "url": "..."}``
+    from stdin and writes one JSON line per request, echoing ``id``. The URL
+    rules, templates and portfolio index are loaded once at start-up, so each
+    email costs only the match and render.
+    """
+    from url_rules import get_url_rules
+    from email_templates import get_email_templates
+    
+    get_url_rules()
+    get_email_templates()
+    print("Template worker ready", file=sys.stderr)
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            result = {"id": None, "success": False, "error": f"Invalid request: {e}"}
+        else:
+            try:
+                result = generate_email_simple(request.get("url") or "")
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            result["id"] = request.get("id")
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
 def main():
     if len(sys.argv) < 2:
         result = {
@@ -58,6 +84,11 @@ def main():
     
     command = sys.argv[1]
     
+    if command == "serve":
+        # Responses are written by the worker itself, one JSON line per request
+        serve()
+        return
+    
     if command == "generate":
         if len(sys.argv) != 3:
             result = {
@@ -82,7 +113,7 @@ def main():
         result = {
             "success": False,
             "error": f"Unknown command: {command}",
-            "available_commands": ["generate", "test"]
+            "available_commands": ["generate", "serve", "test"]
         }
     
     print(json.dumps(result))
@@ -1,40 +1,72 @@
 import csv
+import re
+import sys
+import importlib.util
 import uuid
 import time
+import heapq
 import logging
 import os
 import shutil
+from collections import defaultdict
 
-# Try to import chromadb with fallback
-try:
-    # Fix SQLite version issue for ChromaDB
-    __import__('pysqlite3')
-    import sys
-    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
-except ImportError:
-    pass
-
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-    logger = logging.getLogger(__name__)
-    logger.info("ChromaDB imported successfully")
-except ImportError as e:
-    CHROMADB_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"ChromaDB not available: {e}. Portfolio matching will use simple text matching.")
-except RuntimeError as e:
-    CHROMADB_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"ChromaDB runtime error: {e}. Portfolio matching will use simple text matching.")
+logger = logging.getLogger(__name__)
+
+# chromadb is only imported by a Portfolio that uses vector search, so the
+# template generators (vector_search=False) never pay for importing it
+chromadb = None
+Settings = None
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
+
+
+def _import_chromadb():
+    """Import chromadb on first use; returns False if it cannot be loaded"""
+    global chromadb, Settings, CHROMADB_AVAILABLE
+    if chromadb is not None or not CHROMADB_AVAILABLE:
+        return CHROMADB_AVAILABLE
+
+    try:
+        # Fix SQLite version issue for ChromaDB
+        __import__('pysqlite3')
+        sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+    except ImportError:
+        pass
+
+    try:
+        import chromadb as _chromadb
+        from chromadb.config import Settings as _Settings
+        chromadb, Settings = _chromadb, _Settings
+        logger.info("ChromaDB imported successfully")
+    except ImportError as e:
+        CHROMADB_AVAILABLE = False
+        logger.warning(f"ChromaDB not available: {e}. Portfolio matching will use simple text matching.")
+    except RuntimeError as e:
+        CHROMADB_AVAILABLE = False
+        logger.warning(f"ChromaDB runtime error: {e}. Portfolio matching will use simple text matching.")
+    return CHROMADB_AVAILABLE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+_SKILL_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def _normalize_skill(skill):
+    """Lowercase a skill/tech name and collapse internal whitespace"""
+    return " ".join(skill.lower().split())
+
+
+def _skill_words(skill):
+    """Split a normalized skill into word tokens, keeping names like c++, c# and node.js intact"""
+    return [word.strip(".") for word in _SKILL_WORD_RE.findall(skill) if word.strip(".")]
+
 
 class Portfolio:
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, vector_search=True):
+        """
+        ``vector_search=False`` skips ChromaDB entirely and matches skills
+        with the in-memory index only, as the template generators do.
+        """
         logger.info("📚 Initializing Portfolio class...")
         if file_path is None:
             # Default to the data directory
@@ -46,8 +78,9 @@ class Portfolio:
             reader = csv.DictReader(csvfile)
             for row in reader:
                 self.data.append(row)
+        self._build_skill_index()
         self.vectorstore_path = 'vectorstore'
-        self.chromadb_available = CHROMADB_AVAILABLE
+        self.chromadb_available = vector_search and _import_chromadb()
         
         if self.chromadb_available:
             # Initialize ChromaDB with proper error handling
@@ -219,31 +252,63 @@ class Portfolio:
             # Fallback to simple matching
             return self._simple_skill_matching(skills)
 
+    def _build_skill_index(self):
+        """
+        Build the inverted index used by the fallback matcher.
+
+        ``_tech_index`` maps each normalized Techstack entry (e.g. "node.js")
+        to the row positions containing it, and ``_word_index`` maps the
+        individual words of those entries (e.g. "rails" from "ruby on rails")
+        so partial skill names still match.
+        """
+        self._tech_index = defaultdict(set)
+        self._word_index = defaultdict(set)
+        
+        for position, row in enumerate(self.data):
+            for tech in str(row.get("Techstack") or "").split(","):
+                tech = _normalize_skill(tech)
+                if not tech:
+                    continue
+                self._tech_index[tech].add(position)
+                for word in _skill_words(tech):
+                    self._word_index[word].add(position)
+
+    def match_projects(self, skills, n_results=2):
+        """
+        Return the ``n_results`` CSV rows that cover the most of ``skills``.
+
+        An exact Techstack entry counts 1 and a word-level match 0.5; ties
+        keep CSV order. Rows are returned as read, with ``Techstack`` and
+        ``Links``.
+        """
+        scores = defaultdict(float)
+        for skill in skills or []:
+            skill = _normalize_skill(str(skill))
+            if not skill:
+                continue
+            exact = self._tech_index.get(skill, set())
+            partial = set()
+            for word in _skill_words(skill):
+                partial |= self._word_index.get(word, set())
+            for position in exact:
+                scores[position] += 1.0
+            for position in partial - exact:
+                scores[position] += 0.5
+        
+        top = heapq.nlargest(n_results, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [self.data[position] for position, _ in top]
+
     def _simple_skill_matching(self, skills):
         """Fallback method for portfolio matching when ChromaDB is not available"""
         try:
             if not skills:
                 return []
             
-            # Convert skills to lowercase for matching
-            skills_lower = [skill.lower() for skill in skills]
-            matches = []
-            
-            for _, row in self.data.iterrows():
-                techstack = str(row.get("Techstack", "")).lower()
-                # Check if any skill matches the techstack
-                for skill in skills_lower:
-                    if skill in techstack:
-                        matches.append({"links": str(row.get("Links", ""))})
-                        break  # Avoid duplicate entries for the same project
-                
-                # Limit to 2 matches (similar to ChromaDB query)
-                if len(matches) >= 2:
-                    break
+            matches = [{"links": str(row.get("Links", ""))} for row in self.match_projects(skills)]
             
             logger.info(f"Simple matching found {len(matches)} portfolio matches")
             return matches
             
         except Exception as e:
             logger.error(f"Error in simple skill matching: {e}")
-            return []
\ No newline at end of file
+            return []
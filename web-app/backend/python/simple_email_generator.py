@@ -37,8 +37,8 @@ def generate_email_with_groq(job_url):
     try:
         load_env_vars()
         
-        # Import and initialize Groq
-        from groq import Groq
+        # Shared client backed by the pooled keep-alive HTTP connection
+        from groq_client import get_groq_client
         
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key or api_key.strip() == "your_groq_api_key_here":
@@ -47,7 +47,7 @@ def generate_email_with_groq(job_url):
                 "error": "Valid GROQ_API_KEY not found in environment variables"
             }
         
-        client = Groq(api_key=api_key)
+        client = get_groq_client(api_key)
         
         # Create a comprehensive prompt for email generation
         prompt = f"""You are an expert cold email writer. Generate a professional cold email for a job application.
@@ -0,0 +1,154 @@
+import os
+import re
+import csv
+import logging
+import threading
+from collections import Counter
+from urllib.parse import urlparse, unquote_plus
+
+from skill_matcher import PhraseMatcher, phrase_key
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("role", "level", "company")
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'url_rules.csv')
+
+# Used when the table has no role row without keywords, or cannot be loaded
+DEFAULT_ROLE = {
+    "id": "default", "kind": "role", "keywords": [], "requires": [],
+    "value": "Software Engineer", "level": "Mid-level", "skills": ["Python", "JavaScript", "React"], "focus": "",
+}
+
+_EXTENSION_RE = re.compile(r"\.(?:html?|php|aspx?|jsp|cfm)\b", re.IGNORECASE)
+
+
+def url_text(job_url):
+    """The host labels, path and query of a job URL as plain words"""
+    parsed = urlparse(job_url)
+    host = (parsed.hostname or "").replace(".", " ")
+    path = unquote_plus(f"{parsed.path} {parsed.query}")
+    return f"{host} {_EXTENSION_RE.sub(' ', path)}"
+
+
+def _split_list(value):
+    return [item.strip() for item in (value or "").split("|") if item.strip()]
+
+
+class UrlRules:
+    """
+    Role, level and company rules matched against job URLs.
+
+    ``rules`` is a list of dicts with ``id``, ``kind``, ``keywords``,
+    ``requires`` and the values a rule yields (``value``, ``level``,
+    ``skills``, ``focus``). A rule fires when any keyword phrase and all of
+    its ``requires`` phrases occur in the URL; for each kind the first rule
+    in table order that fires wins, and a role rule without keywords is the
+    default. Every phrase is compiled into one PhraseMatcher, so a URL is
+    scanned once however many rules there are and only rules sharing a
+    phrase with it are looked at.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        self.defaults = {}
+        self._by_phrase = {}
+        self._matcher = PhraseMatcher()
+        for rule in rules:
+            if rule["kind"] not in KINDS:
+                logger.warning(f"Skipping URL rule {rule['id']} of unknown kind {rule['kind']}")
+                continue
+            index = len(self.rules)
+            rule = dict(rule, requires=[phrase_key(phrase) for phrase in rule["requires"]])
+            self.rules.append(rule)
+            if not rule["keywords"]:
+                self.defaults.setdefault(rule["kind"], rule)
+            for phrase in rule["keywords"]:
+                key = phrase_key(phrase)
+                self._by_phrase.setdefault(key, []).append(index)
+                self._matcher.add(phrase, key)
+            for key in rule["requires"]:
+                self._matcher.add(key, key)
+        self.defaults.setdefault("role", DEFAULT_ROLE)
+        self._matcher.compile()
+        self.phrase_count = self._matcher.pattern_count
+
+        self._lock = threading.Lock()
+        self._urls = 0
+        self._fired = Counter()
+
+    @classmethod
+    def from_csv(cls, path=RULES_PATH):
+        """Load ``Rule,Kind,Keywords,Requires,Value,Level,Skills,Focus`` rows; lists are separated by ``|``"""
+        with open(path, newline='', encoding='utf-8') as f:
+            rules = [{
+                "id": row["Rule"],
+                "kind": row["Kind"].strip().lower(),
+                "keywords": _split_list(row.get("Keywords")),
+                "requires": _split_list(row.get("Requires")),
+                "value": row.get("Value", ""),
+                "level": row.get("Level", ""),
+                "skills": _split_list(row.get("Skills")),
+                "focus": row.get("Focus", ""),
+            } for row in csv.DictReader(f)]
+        matcher = cls(rules)
+        logger.info(f"Loaded {len(matcher.rules)} URL rules with {matcher.phrase_count} phrases")
+        return matcher
+
+    def match(self, job_url):
+        """
+        Return ``{kind: rule}`` for every kind, plus ``fired``: the id of
+        the rule that fired for each kind, or None. Where no rule fired the
+        role is the default role and the level and company are None.
+        """
+        phrases = {key for _, _, key in self._matcher.iter_matches(url_text(job_url))}
+        best = {}
+        for key in phrases:
+            for index in self._by_phrase.get(key, ()):
+                rule = self.rules[index]
+                if index < best.get(rule["kind"], len(self.rules)) and all(
+                        required in phrases for required in rule["requires"]):
+                    best[rule["kind"]] = index
+
+        result = {"fired": {}}
+        for kind in KINDS:
+            rule = self.rules[best[kind]] if kind in best else None
+            result["fired"][kind] = rule["id"] if rule else None
+            result[kind] = rule or self.defaults.get(kind)
+
+        with self._lock:
+            self._urls += 1
+            self._fired.update(f"{kind}:{rule_id or 'default'}" for kind, rule_id in result["fired"].items())
+        return result
+
+    def stats(self):
+        """URLs matched, how often each rule fired and, per kind, the share of URLs a rule covered"""
+        with self._lock:
+            urls = self._urls
+            fired = dict(self._fired)
+        coverage = {
+            kind: round(1 - fired.get(f"{kind}:default", 0) / urls, 3) if urls else None
+            for kind in KINDS
+        }
+        return {"urls": urls, "coverage": coverage, "rules": fired}
+
+
+_lock = threading.Lock()
+_rules = None
+
+
+def get_url_rules():
+    """
+    Return the shared rule table, loaded from URL_RULES_PATH (default
+    url_rules.csv) on first use. If it cannot be loaded every URL gets the
+    default role, so the template fallback keeps working.
+    """
+    global _rules
+    with _lock:
+        if _rules is None:
+            try:
+                _rules = UrlRules.from_csv(os.getenv("URL_RULES_PATH", RULES_PATH))
+            except (OSError, KeyError, csv.Error) as e:
+                logger.warning(f"URL rules not available: {e}. Using the default role for every URL.")
+                _rules = UrlRules([])
+    return _rules
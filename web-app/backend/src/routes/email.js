@@ -14,53 +14,18 @@ const validateEmailRequest = [
 ];
 
 // @route   POST /api/email/generate-test
-// @desc    Test email generation with mock data
+// @desc    Test email generation with the template engine (no LLM call)
 // @access  Public
 router.post('/generate-test', async (req, res) => {
   try {
     const { jobUrl } = req.body;
     
-    // Return mock data immediately
-    const mockResult = {
-      success: true,
-      job: {
-        role: "Software Developer",
-        company: "Test Company",
-        skills: ["Python", "JavaScript", "React"]
-      },
-      matched_projects: [
-        {
-          title: "Portfolio Website",
-          description: "A React-based portfolio showcasing web development skills",
-          link: "https://github.com/user/portfolio"
-        }
-      ],
-      email: `Subject: Application for Software Developer Position
-
-Dear Hiring Manager,
-
-I am writing to express my interest in the Software Developer position at Test Company. I found the job posting at ${jobUrl} and believe my skills align well with your requirements.
-
-My experience includes:
-- Python development for backend services
-- JavaScript and React for frontend applications
-- Full-stack web development
-
-I have attached my portfolio project which demonstrates these skills:
-- Portfolio Website: A React-based portfolio showcasing web development skills
-  GitHub: https://github.com/user/portfolio
-
-I would welcome the opportunity to discuss how my skills could contribute to your team.
-
-Best regards,
-[Your Name]`,
-      url: jobUrl,
-      method: "mock_test"
-    };
+    // Same templates and portfolio matches as the degraded mode used during LLM outages
+    const templateResult = await EmailService.trySimpleGeneration(jobUrl || '');
 
     res.json({
       success: true,
-      data: mockResult,
+      data: { ...templateResult, method: 'template_test' },
       message: 'Test email generated successfully'
     });
 
@@ -1,6 +1,10 @@
 const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
+const readline = require('readline');
+
+// A template email takes microseconds once the worker is warm; this only catches a hung worker
+const TEMPLATE_TIMEOUT_MS = 10000;
 
 class EmailService {
   constructor() {
@@ -36,6 +40,10 @@ class EmailService {
     
     this.pythonDir = path.join(__dirname, '..', '..', 'python');
     console.log('🐍 Python directory:', this.pythonDir);
+
+    // Long-lived template worker (no_deps_generator.py serve), started on first use
+    this.templateWorker = null;
+    this.templateRequestId = 0;
   }
 
   /**
@@ -92,9 +100,98 @@ class EmailService {
   }
 
   /**
-   * Try simple template-based email generation
+   * Return the running template worker, starting it if needed. It loads the
+   * URL rules, templates and portfolio once and then answers one JSON line
+   * per request, so template emails do not pay for a Python start-up each.
+   */
+  getTemplateWorker() {
+    if (this.templateWorker) {
+      return this.templateWorker;
+    }
+
+    const pythonScript = path.join(this.pythonDir, 'no_deps_generator.py');
+    console.log(`📐 Starting template worker: ${this.pythonPath} ${pythonScript} serve`);
+    const worker = spawn(this.pythonPath, [pythonScript, 'serve']);
+    worker.pending = new Map();
+
+    const stop = (reason) => {
+      if (this.templateWorker === worker) {
+        this.templateWorker = null;
+      }
+      for (const request of worker.pending.values()) {
+        clearTimeout(request.timer);
+        request.reject(new Error(reason));
+      }
+      worker.pending.clear();
+    };
+
+    readline.createInterface({ input: worker.stdout }).on('line', (line) => {
+      let result;
+      try {
+        result = JSON.parse(line);
+      } catch (parseError) {
+        console.error(`❌ Template worker wrote invalid JSON: ${line.substring(0, 200)}`);
+        return;
+      }
+      const request = worker.pending.get(String(result.id));
+      if (!request) {
+        return;
+      }
+      worker.pending.delete(String(result.id));
+      clearTimeout(request.timer);
+      const { id, ...response } = result;
+      request.resolve(response);
+    });
+
+    worker.stderr.on('data', (data) => {
+      console.log(`🐍 Template worker: ${data.toString().trim()}`);
+    });
+    worker.stdin.on('error', (error) => stop(`Template worker input closed: ${error.message}`));
+    worker.on('exit', (code) => stop(`Template worker exited with code ${code}`));
+    worker.on('error', (error) => stop(`Failed to start template worker: ${error.message}`));
+
+    this.templateWorker = worker;
+    return worker;
+  }
+
+  /**
+   * Render a template email for jobUrl on the template worker
+   */
+  renderTemplate(jobUrl) {
+    return new Promise((resolve, reject) => {
+      const worker = this.getTemplateWorker();
+      const id = String(++this.templateRequestId);
+      const timer = setTimeout(() => {
+        worker.pending.delete(id);
+        reject(new Error(`Template worker did not answer within ${TEMPLATE_TIMEOUT_MS}ms`));
+      }, TEMPLATE_TIMEOUT_MS);
+      worker.pending.set(id, { resolve, reject, timer });
+      worker.stdin.write(JSON.stringify({ id, url: jobUrl }) + '\n');
+    });
+  }
+
+  /**
+   * Try simple template-based email generation, on the template worker when it is available
    */
   async trySimpleGeneration(jobUrl, skills = []) {
+    let result;
+    try {
+      result = await this.renderTemplate(jobUrl);
+    } catch (workerError) {
+      console.warn(`⚠️ Template worker unavailable (${workerError.message}); running the generator once`);
+      return this.runSimpleScript(jobUrl);
+    }
+
+    if (result.success && result.email && result.email.trim()) {
+      return { ...result, method: 'simple_template' };
+    }
+    throw new Error(result.error || 'Simple generation returned empty email');
+  }
+
+  /**
+   * Run no_deps_generator.py once for a single email
+   */
+  async runSimpleScript(jobUrl) {
     return new Promise((resolve, reject) => {
       const pythonScript = path.join(this.pythonDir, 'no_deps_generator.py');
       const args = [pythonScript, 'generate', jobUrl];